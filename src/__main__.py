@@ -12,14 +12,26 @@
 
 import traceback
 import importlib
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import os
 import sys
+import zipfile
+import zipimport
 
-from typing import cast, Any, Union, Iterable, Mapping
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+from typing import TYPE_CHECKING, Any, Union, Mapping
 from pathlib import Path
 
 import unrealsdk  # noqa
 from unrealsdk import logging, config
 
+if TYPE_CHECKING:
+    from mod_loader import DiscoveryIndex, ImportProfiler, ModSource
+
 
 # TODO: Currently debugpy is not setup/available to use.
 
@@ -36,6 +48,32 @@ def get_cfg(key: str, default: Any | None = None) -> Any:
 # If true logs the entire trace; when false only the most recent call is logged.
 FULL_TRACEBACKS: bool = get_cfg("modloader.full_trace", False)
 
+# If true caches which directories are mods in 'sdk_mods/.cache' so unchanged directories are not
+#  listed again on the next launch.
+DISCOVERY_CACHE: bool = get_cfg("modloader.discovery_cache", True)
+
+# If true records the time and memory of every mod import; also enabled by '-profilemods'.
+PROFILE_IMPORTS: bool = get_cfg("modloader.profile_imports", False)
+
+# If true mods whose manifest marks them as deferrable are only imported once they are first used.
+DEFER_IMPORTS: bool = get_cfg("modloader.defer_imports", True)
+
+# If true compiles the mods imported at startup on a thread pool before importing them, keeping all
+#  their bytecode in 'sdk_mods/.cache/pycache'; also enabled by '-precompile'.
+PRECOMPILE: bool = get_cfg("modloader.precompile", False)
+
+# If true mod directories are not added to 'sys.path'; instead their top level modules are indexed
+#  once and resolved by a meta path finder.
+INDEXED_IMPORTS: bool = get_cfg("modloader.indexed_imports", True)
+
+# If true re-imports mods whose files change while the game is running; also enabled by
+#  '-hotreload'.
+HOT_RELOAD: bool = get_cfg("modloader.hot_reload", False)
+
+# If true mods whose manifest sets 'import_thread_safe' have their submodules imported on a thread
+#  pool; their package bodies still run on the game thread.
+PARALLEL_IMPORTS: bool = get_cfg("modloader.parallel_imports", False)
+
 
 ################################################################################
 # | UTILITIES |
@@ -75,49 +113,337 @@ def get_mod_directories() -> list[Path]:
     return all_dirs
 
 
-def is_valid_mod_path(p: Path) -> bool:
-    if not p.is_dir():
-        return False
-
-    name = p.name
-    # Skip these directories
-    if name.startswith(".") or name in (
-            "__pycache__",
-            "mods_base",
-            "input_base",
-            "keybinds",
-            "pyunrealsdk",
-            "unrealsdk"
-    ):
-        return False
-
-    content: list[Path] = list(map(lambda x: x.name, p.iterdir()))
-    if ".sdk_skip" in content or "__init__.py" not in content:
-        return False
+class ModRootFinder(importlib.abc.MetaPathFinder):
+    """
+    Resolves top level imports from the mod directories with a single dict lookup.
+
+    Every root is listed once up front, so imports made anywhere in the process no longer probe each
+    mod directory in turn. The finder sits after the regular path finder and so only answers for
+    names nothing on 'sys.path' provides, which keeps the old behaviour of mod directories being at
+    the end of the search path.
+
+    Directories without an '__init__.py' are namespace packages, spanning every root they appear in,
+    and only used if no regular package or module of the same name exists. Archives can't be
+    validated until the mod loader is importable, so are added afterwards from the mods it
+    discovered.
+    """
+
+    def __init__(self, roots: list[Path]) -> None:
+        self.roots = roots
+        self.index: dict[str, tuple[str, Path]] = {}
+        self.namespaces: dict[str, list[Path]] = {}
+        self.archives: dict[str, Path] = {}
+        self.collisions: dict[str, list[Path]] = {}
+        # Loads the mods' source files, once the mod loader can provide a replacement
+        self.source_loader: type[importlib.machinery.SourceFileLoader] = (
+            importlib.machinery.SourceFileLoader
+        )
+        self.build()
+
+    @staticmethod
+    def _classify(entry: os.DirEntry) -> Union[tuple[str, str], None]:
+        name = entry.name
+        if name.startswith(".") or name == "__pycache__":
+            return None
+
+        if entry.is_dir():
+            if not os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                module, kind = name, "namespace"
+            else:
+                module, kind = name, "package"
+        else:
+            lowered = name.lower()
+            module, kind = "", ""
+            for suffix in importlib.machinery.all_suffixes():
+                if lowered.endswith(suffix):
+                    module, kind = name[:-len(suffix)], "module"
+                    break
+
+        if not module.isidentifier() or module in sys.stdlib_module_names:
+            return None
+        return module, kind
+
+    def _add(self, module: str, kind: str, location: Path) -> None:
+        if module in self.index:
+            self.collisions.setdefault(module, [self.index[module][1]]).append(location)
+            return
+        self.index[module] = (kind, location)
+        self.namespaces.pop(module, None)
+
+    def _add_archive(self, module: str, location: Path) -> None:
+        # Discovery already picked which copy of the mod to use, so the archive always wins
+        replaced = self.index.get(module)
+        if replaced is not None:
+            self.collisions[module] = [location, replaced[1]]
+        self.index[module] = ("archive", location)
+        self.namespaces.pop(module, None)
+
+    def build(self) -> None:
+        self.index = {}
+        self.namespaces = {}
+        self.collisions = {}
+
+        for root in self.roots:
+            try:
+                entries = sorted(os.scandir(root), key=lambda x: x.name)
+            except OSError as ex:
+                logging.warning(f"Failed to index mod directory '{root}': {ex}")
+                continue
+
+            for entry in entries:
+                found = self._classify(entry)
+                if found is None:
+                    continue
+
+                module, kind = found
+                if kind == "namespace":
+                    if module not in self.index:
+                        self.namespaces.setdefault(module, []).append(Path(entry.path))
+                    continue
+                self._add(module, kind, Path(entry.path))
+
+        for module, archive in self.archives.items():
+            self._add_archive(module, archive)
+
+    def add_archives(self, mod_paths: list["ModSource"]) -> None:
+        """
+        Indexes the archived mods out of a discovery pass, which has already validated them.
+
+        Args:
+            mod_paths: The mods which were discovered.
+        """
+        for p in mod_paths:
+            if isinstance(p, zipfile.Path) and p.name not in self.archives:
+                self.archives[p.name] = Path(p.root.filename)
+                self._add_archive(p.name, self.archives[p.name])
+
+    def log_collisions(self) -> None:
+        for module, paths in self.collisions.items():
+            ignored = ", ".join(f"'{p}'" for p in paths[1:])
+            logging.warning(
+                f"Module '{module}' is provided more than once; using '{paths[0]}' over {ignored}"
+            )
+
+    def install(self) -> None:
+        # Sit just after the regular path finder, so a mod never shadows anything on 'sys.path'
+        for i, finder in enumerate(sys.meta_path):
+            if finder is importlib.machinery.PathFinder:
+                sys.meta_path.insert(i + 1, self)
+                return
+        sys.meta_path.append(self)
+
+    def invalidate_caches(self) -> None:
+        self.build()
+
+    def find_spec(
+            self,
+            fullname: str,
+            path: Any = None,
+            target: Any = None,
+    ) -> Union[importlib.machinery.ModuleSpec, None]:
+        # Submodules are found through their package's '__path__' as usual
+        if path is not None:
+            return None
+
+        found = self.index.get(fullname)
+        if found is None:
+            portions = self.namespaces.get(fullname)
+            if portions is None:
+                return None
+            spec = importlib.machinery.ModuleSpec(fullname, None, is_package=True)
+            spec.submodule_search_locations = [str(p) for p in portions]
+            return spec
+
+        kind, location = found
+        if kind == "package":
+            init = location / "__init__.py"
+            return importlib.util.spec_from_file_location(
+                fullname,
+                init,
+                loader=self.source_loader(fullname, str(init)),
+                submodule_search_locations=[str(location)],
+            )
+        if kind == "archive":
+            return zipimport.zipimporter(str(location)).find_spec(fullname)
+        if location.suffix.lower() in importlib.machinery.SOURCE_SUFFIXES:
+            return importlib.util.spec_from_file_location(
+                fullname,
+                location,
+                loader=self.source_loader(fullname, str(location)),
+            )
+        return importlib.util.spec_from_file_location(fullname, location)
+
+
+def get_log_file() -> Path:
+    # Relative paths are relative to the sdk dll which is installed into 'Binaries/Plugins'
+    log_file = Path(get_cfg("unrealsdk.log_file", "unrealsdk.log"))
+    if not log_file.is_absolute():
+        log_file = Path(__file__).parent.parent.absolute() / "Binaries" / "Plugins" / log_file
+    return log_file
+
+
+@dataclass
+class LoadSummary:
+    loaded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    deferred: int = 0
+    disabled: int = 0
 
-    return True
 
+def discover_mods(
+        mod_dirs: list[Path],
+        index: Union["DiscoveryIndex", None] = None,
+) -> list["ModSource"]:
+    from mod_loader import is_valid_mod_path, open_mod_source
 
-def load_mods_from_dir(mod_dir: Path) -> (int, int):
-    mods_loaded = 0
-    mods_failed = 0
-    for p in cast(Iterable[Path], mod_dir.iterdir()):
+    mods: dict[str, "ModSource"] = {}
+    for mod_dir in mod_dirs:
+        if index is None:
+            children = {p.name: is_valid_mod_path(p) for p in mod_dir.iterdir()}
+        else:
+            children = index.scan(mod_dir)
+
+        for name, is_valid in children.items():
+
+            if name.lower() == "input_base":
+                logging.info(f"Skipping input base '{name}' this directory can be"
+                             f" deleted since it was renamed to 'keybinds'")
+                continue
+
+            if not is_valid:
+                continue
+
+            # The first directory on the search path wins, same as it would when importing
+            source = open_mod_source(mod_dir / name)
+            if source.name not in mods:
+                mods[source.name] = source
+
+    return list(mods.values())
+
+
+def load_mods(
+        mod_paths: list["ModSource"],
+        profiler: Union["ImportProfiler", None] = None,
+        parallel_imports: bool = False,
+        precompile: bool = False,
+) -> LoadSummary:
+    from mod_loader import (
+        DeferredMod,
+        ModManifest,
+        ParallelImporter,
+        disabled_mods,
+        exclude_eager_dependencies,
+        import_mod,
+        mod_dependencies,
+        mod_sources,
+        order_by_dependencies,
+        precompile_mods,
+        read_manifest,
+        scan_optional_imports,
+        scan_top_level_imports,
+        was_enabled_last_session,
+    )
+    from mods_base.mod_list import register_mod
+
+    # Disabled mods still get a node in the graph, so their dependents are skipped, but it has no
+    #  edges, and none of their files are opened
+    manifests = {
+        p.name: (
+            ModManifest(p.name, p.name, dependencies=[])
+            if p.name in disabled_mods
+            else read_manifest(p)
+        )
+        for p in mod_paths
+    }
+    dependencies = {
+        p.name: (
+            set(manifests[p.name].dependencies)
+            if manifests[p.name].dependencies is not None
+            else scan_top_level_imports(p)
+        )
+        for p in mod_paths
+    }
+    # Optional imports order the load, but a mod isn't skipped if one of them fails
+    load_order = {
+        p.name: (
+            dependencies[p.name]
+            if manifests[p.name].dependencies is not None
+            else dependencies[p.name] | scan_optional_imports(p)
+        )
+        for p in mod_paths
+    }
+    mod_sources.update((p.name, p) for p in mod_paths)
+    mod_dependencies.update(load_order)
+
+    # Deferred mods stay on disk until they're enabled or opened, unless they were left enabled, or
+    #  a mod imported at startup depends on them
+    deferrable = {
+        module for module, manifest in manifests.items()
+        if DEFER_IMPORTS and manifest.deferrable and not was_enabled_last_session(module)
+    }
+    eager = [m for m in manifests if m not in deferrable and m not in disabled_mods]
+    deferred = exclude_eager_dependencies(deferrable, eager, load_order)
+
+    # Archived mods go through zipimport, which never writes bytecode
+    if precompile:
+        precompile_mods(
+            p for p in mod_paths
+            if isinstance(p, Path) and p.name not in deferred and p.name not in disabled_mods
+        )
+
+    parallel: Union[ParallelImporter, None] = None
+    if parallel_imports:
+        parallel = ParallelImporter(
+            {
+                p.name: p for p in mod_paths
+                if manifests[p.name].import_thread_safe
+                and p.name not in deferred
+                and p.name not in disabled_mods
+            },
+            load_order,
+            manifests.keys(),
+        )
+        parallel.start()
+
+    summary = LoadSummary()
+
+    # Maps every mod that can't be loaded to the failed or disabled mod responsible for it
+    blocked_by: dict[str, str] = {}
+    skipped: dict[str, list[str]] = {}
+
+    for module in order_by_dependencies(list(manifests), load_order):
+        manifest = manifests[module]
+
+        cause = next((blocked_by[dep] for dep in dependencies[module] if dep in blocked_by), None)
+        if cause is not None:
+            blocked_by[module] = cause
+            skipped.setdefault(cause, []).append(module)
+            summary.skipped += 1
+            continue
 
-        if p.name.lower() == "input_base":
-            logging.info(f"Skipping input base '{p.name}' this directory can be"
-                         f" deleted since it was renamed to 'keybinds'")
+        if module in disabled_mods:
+            blocked_by[module] = module
+            summary.disabled += 1
             continue
 
-        if not is_valid_mod_path(p):
+        if module in deferred:
+            register_mod(DeferredMod.from_manifest(manifest))
+            summary.deferred += 1
             continue
 
-        module = p.name
         try:
-            importlib.import_module(module)
-            mods_loaded += 1
+            prepared = None if parallel is None else parallel.take(module)
+            with nullcontext() if profiler is None else profiler.measure(module):
+                import_mod(module, prepared)
+            summary.loaded += 1
+
+            if parallel is not None:
+                parallel.finished(module)
 
         except Exception as err:
-            mods_failed += 1
+            summary.failed += 1
+            blocked_by[module] = module
             logging.error(f"Failed to load python module: '{module}'")
             tb = traceback.extract_tb(err.__traceback__)
 
@@ -127,7 +453,15 @@ def load_mods_from_dir(mod_dir: Path) -> (int, int):
             logging.error("".join(traceback.format_exception_only(err)))
             logging.error("".join(traceback.format_list(tb)))
 
-    return mods_loaded, mods_failed
+    if parallel is not None:
+        parallel.close()
+
+    for cause, mods in skipped.items():
+        logging.error(
+            f"Skipped {len(mods)} mods depending on unloaded module '{cause}': {', '.join(mods)}"
+        )
+
+    return summary
 
 
 def get_launch_args() -> list[str]:
@@ -173,6 +507,9 @@ def get_launch_args() -> list[str]:
 ################################################################################
 
 args = list(map(lambda arg: arg.lower(), get_launch_args()[1:]))
+PROFILE_IMPORTS = PROFILE_IMPORTS or "-profilemods" in args
+PRECOMPILE = PRECOMPILE or "-precompile" in args
+HOT_RELOAD = HOT_RELOAD or "-hotreload" in args
 
 if "-editor" not in args:
     logging.info("Loading mods normally...")
@@ -181,24 +518,100 @@ if "-editor" not in args:
     # another will cause issues. So before we do any importing we ensure all possible imports can
     # resolve.
     all_mod_directories = get_mod_directories()
-    for p in all_mod_directories:
-        if p not in sys.path:
-            logging.info(f"Adding directory to search path: '{p}'")
-            sys.path.append(str(p))
+    if INDEXED_IMPORTS:
+        mod_finder = ModRootFinder(all_mod_directories)
+        mod_finder.install()
+    else:
+        for p in all_mod_directories:
+            if p not in sys.path:
+                logging.info(f"Adding directory to search path: '{p}'")
+                sys.path.append(str(p))
 
     import keybinds  # noqa
-    from mods_base.mod_list import register_base_mod
-
-    failed: int = 0
-    succeeded: int = 0
+    from mods_base.mod_list import base_mod, register_base_mod
+    from mod_loader import (
+        CentralCacheLoader,
+        DiscoveryIndex,
+        HotReloader,
+        ImportProfiler,
+        disabled_mods,
+        install_central_cache,
+        track_registrations,
+    )
+
+    # Mods imported from here on keep their bytecode in one place, rather than each creating its own
+    #  '__pycache__'
+    if PRECOMPILE:
+        install_central_cache(all_mod_directories, all_mod_directories[0] / ".cache" / "pycache")
+        if INDEXED_IMPORTS:
+            mod_finder.source_loader = CentralCacheLoader
+
+    disabled_mods.pinned = frozenset(get_cfg("disabled_mods.modules", []))
+    disabled_mods.load()
+
+    discovery_index: Union[DiscoveryIndex, None] = None
+    if DISCOVERY_CACHE:
+        discovery_index = DiscoveryIndex(all_mod_directories[0] / ".cache" / "discovery.json")
+        discovery_index.load()
+
+    profiler: Union[ImportProfiler, None] = None
+    if PROFILE_IMPORTS:
+        profiler = ImportProfiler()
+        profiler.start()
+
+    mod_paths = discover_mods(all_mod_directories, discovery_index)
+    base_mod.options.append(disabled_mods.create_option(p.name for p in mod_paths))
+
+    # Archived mods are imported through zipimport, which needs the archive itself on the path
+    #  unless the finder already knows about it
+    mod_archives = [p.root for p in mod_paths if isinstance(p, zipfile.Path)]
+    if INDEXED_IMPORTS:
+        mod_finder.add_archives(mod_paths)
+        mod_finder.log_collisions()
+        logging.info(
+            f"Indexed {len(mod_finder.index) + len(mod_finder.namespaces)} modules from"
+            f" {len(all_mod_directories)} mod directories"
+        )
+    else:
+        for archive in mod_archives:
+            if archive.filename not in sys.path:
+                sys.path.append(archive.filename)
+
+    # Profiling measures one import at a time, which doesn't mix with importing several at once
+    if PARALLEL_IMPORTS and profiler is not None:
+        logging.info("Import profiling is enabled; parallel imports have been turned off")
+        PARALLEL_IMPORTS = False
+
+    # Reloading needs to know what each mod registered outside of its Mod object
+    if HOT_RELOAD:
+        track_registrations()
 
     # Load all user mods
-    for p in all_mod_directories:
-        good, bad = load_mods_from_dir(p)
-        succeeded += good
-        failed += bad
+    summary = load_mods(mod_paths, profiler, PARALLEL_IMPORTS, PRECOMPILE)
+
+    for archive in mod_archives:
+        archive.close()
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.log_report()
+        log_file = get_log_file()
+        profiler.write_json(log_file.with_name(f"{log_file.stem}.imports.json"))
+
+    if discovery_index is not None:
+        discovery_index.save()
+        logging.info(f"Mod discovery index: {discovery_index.stats}")
 
     register_base_mod()
-    logging.info(f"Loaded {succeeded} mods successfully, {failed} failed.")
+
+    if HOT_RELOAD:
+        hot_reloader = HotReloader(all_mod_directories)
+        hot_reloader.start()
+
+    logging.info(
+        f"Loaded {summary.loaded} mods successfully, {summary.failed} failed,"
+        f" {summary.skipped} skipped, {summary.deferred} deferred,"
+        f" {summary.disabled} disabled."
+    )
 else:
     logging.info("Editor launch argument provided; Not loading mods.")
@@ -4,7 +4,10 @@ from typing import cast
 from mods_base import KeybindType
 from mods_base.keybinds import KeybindCallback_Event, KeybindCallback_NoArgs
 from mods_base.mod_list import base_mod
-from .keybinds import register_keybind, deregister_keybind
+from .keybinds import register_chord, register_keybind, deregister_keybind
+from .sigscan_cache import log_input_hook
+
+log_input_hook()
 
 ################################################################################
 # | MODS METADATA |
@@ -39,7 +42,17 @@ def enable_keybind(self: KeybindType) -> None:
     if self.key.upper() in ("ANY", "ANY_KEY", "ANYKEY"):
         actual_key = None
 
-    if self.event_filter is None:
+    # Chords such as 'Ctrl+F5'; no key name contains a '+' itself
+    if actual_key is not None and "+" in actual_key.strip("+"):
+        *modifiers, chord_key = (part.strip() for part in actual_key.split("+"))
+        handle = register_chord(
+            modifiers,
+            chord_key,
+            True,
+            self.callback,
+            filter=self.event_filter,
+        )
+    elif self.event_filter is None:
         handle = register_keybind(
             actual_key,
             self.event_filter,
@@ -69,7 +82,7 @@ def disable_keybind(self: KeybindType) -> None:
         return
 
     deregister_keybind(handle)
-    setattr(self, "_native_handle", handle)
+    setattr(self, "_native_handle", None)
 
 
 KeybindType.disable = disable_keybind
@@ -80,6 +93,7 @@ def rebind_keybind(self: KeybindType, new_key: str | None) -> None:
     handle = getattr(self, "_native_handle", None)
     if handle is not None:
         deregister_keybind(handle)
+        setattr(self, "_native_handle", None)
 
     if self.is_enabled:
         self.key = new_key
@@ -5,7 +5,12 @@
 //
 
 #include "pyunrealsdk/pch.h"
+#include <bit>
+#include <cmath>
+#include <thread>
+#include <pybind11/stl/filesystem.h>
 #include <pyunrealsdk/hooks.h>
+#include "pyunrealsdk/logging.h"
 #include "pyunrealsdk/static_py_object.h"
 #include "pyunrealsdk/unreal_bindings/uenum.h"
 
@@ -35,83 +40,1712 @@ constexpr EInputEvent IE_DoubleClick = 3;
 constexpr EInputEvent IE_Axis = 4;
 constexpr EInputEvent IE_MAX = 5;
 
+// One bit per EInputEvent
+using EventMask = uint8_t;
+constexpr EventMask ALL_EVENTS = (1 << IE_MAX) - 1;
+
+constexpr EventMask event_bit(EInputEvent event) {
+    return static_cast<EventMask>(1 << event);
+}
+
+using Clock = std::chrono::steady_clock;
+
+// The arguments a callback is passed, fixed when it's registered
+using CallShape = uint8_t;
+constexpr CallShape CALL_NO_ARGS = 0;
+constexpr CallShape CALL_WITH_EVENT = 1 << 0;
+constexpr CallShape CALL_WITH_KEY = 1 << 1;
+
+// Latency buckets are powers of two microseconds: [0, 1), [1, 2), [2, 4) ... with the last one
+// open ended
+constexpr size_t LATENCY_BUCKETS = 16;
+
+// Only collected while profiling, and only ever touched while holding the GIL
+struct CallStats {
+    uint64_t calls{};
+    Clock::duration total{};
+    Clock::duration max{};
+    std::array<uint64_t, LATENCY_BUCKETS> histogram{};
+
+    void record(Clock::duration elapsed) {
+        calls++;
+        total += elapsed;
+        max = std::max(max, elapsed);
+
+        auto micros = std::chrono::duration_cast<std::chrono::microseconds>(elapsed).count();
+        auto bucket = static_cast<size_t>(std::bit_width(static_cast<uint64_t>(micros)));
+        histogram[std::min(bucket, LATENCY_BUCKETS - 1)]++;
+    }
+};
+
+// The handle given to python is the keybind's address, so it indexes straight to its storage
+using KeybindHandle = void*;
+
+// A raw keybind frame; only the frame on top of the stack is active, the rest are suspended
+struct KeybindFrame {
+    size_t id{};
+    std::atomic<bool> suspended{};  // Also read from stale snapshots and deferred events
+    std::unordered_set<KeybindHandle> keybinds{};
+};
+
 struct PY_OBJECT_VISIBILITY KeybindInfo {
     pyunrealsdk::StaticPyObject callback;
-    std::optional<EInputEvent> filter;
+    std::vector<FName> keys;  // Empty for any key
+    EventMask events{};
     bool is_gameplay{};
-    bool is_any_key{};
+    CallShape call_shape{};
+    bool deferred{};  // Queued and called on the next tick, so it can't block input
+    size_t order{};
+    std::shared_ptr<KeybindFrame> frame;
+    std::atomic<bool> removed{};
+    CallStats stats{};
+};
+
+// The last value an axis bind delivered for one key, and the value waiting for the next frame
+struct AxisState {
+    float delivered{};
+    float pending{};
+    bool has_pending{};
+};
+
+struct PY_OBJECT_VISIBILITY AxisBindInfo {
+    pyunrealsdk::StaticPyObject callback;
+    std::vector<FName> keys;  // Empty for any key
+    bool is_gameplay{};
+    CallShape call_shape{};
+    size_t order{};
+    float dead_zone{};
+    float threshold{};
+    bool coalesce{};
+
+    // May be set from any thread, the states are only touched from the game thread
+    std::atomic<bool> removed{};
+    std::unordered_map<FName, AxisState> states{};
+    CallStats stats{};
+};
+
+// Stops the game from seeing matching input, without ever entering python
+struct BlockRule {
+    std::vector<FName> keys;  // Empty for any key
+    EventMask events{};
+    std::optional<bool> is_gameplay;  // Empty for both contexts
+    std::atomic<bool> enabled;
+};
+
+// A key pressed while a set of modifiers is held
+struct PY_OBJECT_VISIBILITY ChordInfo {
+    pyunrealsdk::StaticPyObject callback;
+    std::vector<std::vector<FName>> modifiers;  // Each is held if any of its keys are
+    uint8_t standard_modifiers{};               // Bits of STANDARD_MODIFIERS which are included
+    FName key;
+    EventMask events{};
+    bool is_gameplay{};
+    CallShape call_shape{};
+    size_t order{};
+    std::atomic<bool> removed{};  // May be set from any thread
+    CallStats stats{};
+};
+
+// Keys pressed one after another, all within a time limit
+struct PY_OBJECT_VISIBILITY SequenceInfo {
+    pyunrealsdk::StaticPyObject callback;
+    std::vector<FName> keys;
+    Clock::duration timeout{};
+    bool is_gameplay{};
+    size_t order{};
+
+    // For each prefix of keys, the length of the longest proper prefix which is also a suffix of it
+    std::vector<size_t> fallback;
+
+    // May be set from any thread
+    std::atomic<bool> removed{};
+
+    // Only touched from the game thread
+    size_t progress{};
+    size_t presses{};
+    std::vector<Clock::time_point> press_times;  // The last keys.size() presses, as a ring
+    CallStats stats{};
+};
+
+// The last reference to a bind can be dropped from the input hook, which doesn't hold the GIL
+struct GilDeleter {
+    template <typename T>
+    void operator()(T* info) const {
+        // The callback is a StaticPyObject, which looks after itself once python's finalized
+        if (Py_IsInitialized() == 0) {
+            delete info;
+            return;
+        }
+        const py::gil_scoped_acquire gil{};
+        delete info;
+    }
+};
+
+pyunrealsdk::StaticPyObject input_event_enum = pyunrealsdk::unreal::enum_as_py_enum(
+    validate_type<UEnum>(unrealsdk::find_object(L"Enum", L"Core.Object.EInputEvent"))
+);
+
+// ############################################################################//
+//  | PYTHON OBJECT CACHES |
+// ############################################################################//
+
+// Only ever touched while holding the GIL. These hold strong references which are deliberately
+// never released, so they stay valid for the life of the process, even past finalization.
+std::array<PyObject*, IE_MAX> input_event_members{};
+std::unordered_map<FName, PyObject*> key_name_cache{};
+size_t key_name_cache_hits = 0;
+size_t key_name_cache_misses = 0;
+
+// Warmed at import so the common keys never miss
+constexpr auto COMMON_KEY_NAMES = std::to_array<const wchar_t*>({
+    L"A", L"B", L"C", L"D", L"E", L"F", L"G", L"H", L"I", L"J", L"K", L"L", L"M",
+    L"N", L"O", L"P", L"Q", L"R", L"S", L"T", L"U", L"V", L"W", L"X", L"Y", L"Z",
+    L"Zero", L"One", L"Two", L"Three", L"Four", L"Five", L"Six", L"Seven", L"Eight", L"Nine",
+    L"F1", L"F2", L"F3", L"F4", L"F5", L"F6", L"F7", L"F8", L"F9", L"F10", L"F11", L"F12",
+    L"LeftMouseButton", L"RightMouseButton", L"MiddleMouseButton",
+    L"MouseScrollUp", L"MouseScrollDown", L"MouseX", L"MouseY",
+    L"SpaceBar", L"Enter", L"Escape", L"Tab", L"LeftShift", L"LeftControl", L"LeftAlt",
+});
+
+PyObject* get_input_event(EInputEvent event) {
+    return input_event_members[event];
+}
+
+PyObject* get_key_name(const FName& key) {
+    if (auto it = key_name_cache.find(key); it != key_name_cache.end()) {
+        key_name_cache_hits++;
+        return it->second;
+    }
+
+    key_name_cache_misses++;
+    PyObject* name = py::str(std::string(key)).release().ptr();
+    PyUnicode_InternInPlace(&name);
+    key_name_cache.emplace(key, name);
+    return name;
+}
+
+void warm_py_caches() {
+    for (EInputEvent event = 0; event < IE_MAX; ++event) {
+        input_event_members[event] = input_event_enum(event).release().ptr();
+    }
+    for (const wchar_t* name : COMMON_KEY_NAMES) {
+        get_key_name(FName{std::wstring{name}});
+    }
+
+    // Warming isn't a miss anyone caused
+    key_name_cache_misses = 0;
+}
+
+std::unordered_map<KeybindHandle, std::shared_ptr<KeybindInfo>> keybinds_by_handle{};
+std::unordered_map<KeybindHandle, std::shared_ptr<AxisBindInfo>> axes_by_handle{};
+std::unordered_map<KeybindHandle, std::shared_ptr<BlockRule>> block_rules_by_handle{};
+std::unordered_map<KeybindHandle, std::shared_ptr<ChordInfo>> chords_by_handle{};
+std::unordered_map<KeybindHandle, std::shared_ptr<SequenceInfo>> sequences_by_handle{};
+std::atomic<size_t> next_keybind_order = 0;
+
+std::vector<std::shared_ptr<KeybindFrame>> frame_stack{};
+size_t next_frame_id = 1;
+
+// ############################################################################//
+//  | PROFILING |
+// ############################################################################//
+
+bool profiling_enabled = false;
+
+// How long the input hook held the GIL in each frame
+struct FrameStats {
+    uint64_t frames{};
+    Clock::duration total{};
+    Clock::duration max{};
+    Clock::duration last{};
+};
+FrameStats frame_stats{};
+Clock::duration gil_time_this_frame{};
+
+// Adds how long it was alive to the current frame's GIL time; create it right after taking the GIL
+class GilHoldTimer {
+    Clock::time_point start = profiling_enabled ? Clock::now() : Clock::time_point{};
+
+   public:
+    GilHoldTimer() = default;
+    GilHoldTimer(const GilHoldTimer&) = delete;
+    GilHoldTimer& operator=(const GilHoldTimer&) = delete;
+
+    ~GilHoldTimer() {
+        if (profiling_enabled && start != Clock::time_point{}) {
+            gil_time_this_frame += Clock::now() - start;
+        }
+    }
+};
+
+// Takes the GIL the first time something needs it, if ever
+class PY_OBJECT_VISIBILITY LazyGil {
+    std::optional<py::gil_scoped_acquire> gil;
+    std::optional<GilHoldTimer> timer;
+
+   public:
+    void ensure() {
+        if (!gil.has_value()) {
+            gil.emplace();
+            timer.emplace();
+        }
+    }
+};
+
+// Records a single callback call, create it while holding the GIL
+class CallTimer {
+    CallStats& stats;
+    Clock::time_point start = profiling_enabled ? Clock::now() : Clock::time_point{};
+
+   public:
+    explicit CallTimer(CallStats& stats) : stats(stats) {}
+    CallTimer(const CallTimer&) = delete;
+    CallTimer& operator=(const CallTimer&) = delete;
+
+    ~CallTimer() {
+        if (profiling_enabled && start != Clock::time_point{}) {
+            stats.record(Clock::now() - start);
+        }
+    }
+};
+
+void end_profiled_frame() {
+    if (!profiling_enabled) {
+        return;
+    }
+
+    frame_stats.frames++;
+    frame_stats.total += gil_time_this_frame;
+    frame_stats.max = std::max(frame_stats.max, gil_time_this_frame);
+    frame_stats.last = gil_time_this_frame;
+    gil_time_this_frame = {};
+}
+
+// ############################################################################//
+//  | DISPATCH TABLE |
+// ############################################################################//
+
+using KeybindList = std::vector<std::shared_ptr<KeybindInfo>>;
+using AxisList = std::vector<std::shared_ptr<AxisBindInfo>>;
+using BlockRuleList = std::vector<std::shared_ptr<BlockRule>>;
+using ChordList = std::vector<std::shared_ptr<ChordInfo>>;
+using SequenceList = std::vector<std::shared_ptr<SequenceInfo>>;
+
+// Every bind for a single key, pre-filtered by context and event in registration order
+struct PY_OBJECT_VISIBILITY DispatchEntry {
+    std::array<std::array<KeybindList, IE_MAX>, 2> keybinds{};
+    std::array<AxisList, 2> axes{};
+    std::array<std::array<BlockRuleList, IE_MAX>, 2> block_rules{};
+    std::array<ChordList, 2> chords{};
+
+    [[nodiscard]] const KeybindList& get(bool is_gameplay, EInputEvent event) const {
+        return keybinds[is_gameplay ? 1 : 0][event];
+    }
+
+    [[nodiscard]] const AxisList& get_axes(bool is_gameplay) const {
+        return axes[is_gameplay ? 1 : 0];
+    }
+
+    [[nodiscard]] const BlockRuleList& get_block_rules(bool is_gameplay, EInputEvent event) const {
+        return block_rules[is_gameplay ? 1 : 0][event];
+    }
+};
+
+struct PY_OBJECT_VISIBILITY DispatchTable {
+    uint64_t version{};
+
+    DispatchEntry any_key{};
+    std::unordered_map<FName, DispatchEntry> by_key{};
+
+    // Every sequence has to see every press, so they aren't split by key
+    std::array<SequenceList, 2> sequences{};
+};
+
+template <typename T>
+std::vector<std::shared_ptr<T>> sorted_by_order(
+    const std::unordered_map<KeybindHandle, std::shared_ptr<T>>& by_handle
+) {
+    std::vector<std::shared_ptr<T>> ordered{};
+    ordered.reserve(by_handle.size());
+    for (const auto& [_, info] : by_handle) {
+        ordered.push_back(info);
+    }
+    std::ranges::sort(ordered, {}, &T::order);
+    return ordered;
+}
+
+// Registrations change the registries under this lock, and mark the published snapshot stale. A
+// new immutable snapshot is built once before the next input or tick, so a batch of registrations
+// only costs one. The input path only ever tries the lock, and otherwise reads the latest snapshot.
+std::mutex registry_mutex;
+
+// Always taken with the GIL released, so a thread waiting on the lock never holds the GIL the
+// thread with the lock may need
+class RegistryLock {
+    std::unique_lock<std::mutex> lock;
+
+   public:
+    RegistryLock() {
+        const py::gil_scoped_release gil{};
+        lock = std::unique_lock{registry_mutex};
+    }
+};
+
+const DispatchTable empty_dispatch_table{};
+std::atomic<const DispatchTable*> published_table{&empty_dispatch_table};
+std::atomic<bool> dispatch_table_stale = false;
+uint64_t dispatch_table_version = 0;
+
+// Every published snapshot which may still be in use, latest last; guarded by the registry lock
+std::vector<std::unique_ptr<const DispatchTable>> snapshots{};
+std::atomic<size_t> active_readers = 0;
+
+// Pins the latest snapshot. A snapshot is only freed once no reader is active after a newer one was
+// published, so any reader which could have seen it has finished.
+class PY_OBJECT_VISIBILITY SnapshotReader {
+    const DispatchTable* table;
+
+   public:
+    SnapshotReader() {
+        active_readers.fetch_add(1);
+        table = published_table.load();
+    }
+    ~SnapshotReader() { active_readers.fetch_sub(1); }
+
+    SnapshotReader(const SnapshotReader&) = delete;
+    SnapshotReader& operator=(const SnapshotReader&) = delete;
+
+    [[nodiscard]] const DispatchTable& operator*() const { return *table; }
+};
+
+std::unique_ptr<DispatchTable> build_dispatch_table() {
+    KeybindList ordered{};
+    ordered.reserve(keybinds_by_handle.size());
+    for (const auto& [_, info] : keybinds_by_handle) {
+        if (info->frame == nullptr || !info->frame->suspended) {
+            ordered.push_back(info);
+        }
+    }
+    std::ranges::sort(ordered, {}, &KeybindInfo::order);
+
+    auto table = std::make_unique<DispatchTable>();
+    for (const std::shared_ptr<KeybindInfo>& info : ordered) {
+        auto add_to = [&info](DispatchEntry& entry) {
+            auto& contexts = entry.keybinds[info->is_gameplay ? 1 : 0];
+            for (EInputEvent event = 0; event < IE_MAX; ++event) {
+                if ((info->events & event_bit(event)) != 0) {
+                    contexts[event].push_back(info);
+                }
+            }
+        };
+
+        if (info->keys.empty()) {
+            add_to(table->any_key);
+        }
+        for (const FName& key : info->keys) {
+            add_to(table->by_key[key]);
+        }
+    }
+
+    for (const std::shared_ptr<AxisBindInfo>& info : sorted_by_order(axes_by_handle)) {
+        const size_t context = info->is_gameplay ? 1 : 0;
+        if (info->keys.empty()) {
+            table->any_key.axes[context].push_back(info);
+        }
+        for (const FName& key : info->keys) {
+            table->by_key[key].axes[context].push_back(info);
+        }
+    }
+
+    for (const std::shared_ptr<ChordInfo>& info : sorted_by_order(chords_by_handle)) {
+        table->by_key[info->key].chords[info->is_gameplay ? 1 : 0].push_back(info);
+    }
+    for (const std::shared_ptr<SequenceInfo>& info : sorted_by_order(sequences_by_handle)) {
+        table->sequences[info->is_gameplay ? 1 : 0].push_back(info);
+    }
+
+    // Rules are only ever checked for any match, so their order doesn't matter
+    for (const auto& [_, rule] : block_rules_by_handle) {
+        auto add_to = [&rule](DispatchEntry& entry) {
+            for (size_t context = 0; context < entry.block_rules.size(); ++context) {
+                if (rule->is_gameplay.has_value() && *rule->is_gameplay != (context == 1)) {
+                    continue;
+                }
+                for (EInputEvent event = 0; event < IE_MAX; ++event) {
+                    if ((rule->events & event_bit(event)) != 0) {
+                        entry.block_rules[context][event].push_back(rule);
+                    }
+                }
+            }
+        };
+
+        if (rule->keys.empty()) {
+            add_to(table->any_key);
+        }
+        for (const FName& key : rule->keys) {
+            add_to(table->by_key[key]);
+        }
+    }
+    return table;
+}
+
+// Requires the registry lock. Old snapshots own bind infos, so freeing them may need the GIL.
+void reclaim_snapshots() {
+    if (snapshots.size() > 1 && active_readers.load() == 0) {
+        snapshots.erase(snapshots.begin(), snapshots.end() - 1);
+    }
+}
+
+// Requires the registry lock
+void publish_dispatch_table() {
+    auto table = build_dispatch_table();
+    table->version = ++dispatch_table_version;
+    dispatch_table_stale.store(false);
+    published_table.store(table.get());
+    snapshots.push_back(std::move(table));
+    reclaim_snapshots();
+}
+
+// Requires the registry lock
+void invalidate_dispatch_table() {
+    dispatch_table_stale.store(true);
+}
+
+// Called before reading the snapshot. Never waits on a registration in progress on another thread,
+// the previous snapshot is used until it's finished.
+void refresh_dispatch_table() noexcept {
+    if (!dispatch_table_stale.load()) {
+        return;
+    }
+    const std::unique_lock lock{registry_mutex, std::try_to_lock};
+    if (!lock.owns_lock()) {
+        return;
+    }
+    try {
+        publish_dispatch_table();
+    } catch (const std::bad_alloc&) {
+        // Still stale, so it's tried again next time
+    }
+}
+
+// ############################################################################//
+//  | DISPATCH KEY EVENTS |
+// ############################################################################//
+
+// The first slot of args is left free, which lets vectorcall prepend 'self' without a copy
+template <size_t n>
+py::object vectorcall(const py::object& callable, std::array<PyObject*, n>& args, size_t nargs) {
+    PyObject* ret = PyObject_Vectorcall(
+        callable.ptr(), &args[1], nargs | PY_VECTORCALL_ARGUMENTS_OFFSET, nullptr
+    );
+    if (ret == nullptr) {
+        throw py::error_already_set();
+    }
+    return py::reinterpret_steal<py::object>(ret);
+}
+
+py::object call_keybind(const KeybindInfo& info, PyObject* event_type, PyObject* key_str) {
+    std::array<PyObject*, 3> args{};
+    size_t nargs = 0;
+    if ((info.call_shape & CALL_WITH_EVENT) != 0) {
+        args[1 + nargs++] = event_type;
+    }
+    if ((info.call_shape & CALL_WITH_KEY) != 0) {
+        args[1 + nargs++] = key_str;
+    }
+    return vectorcall(info.callback, args, nargs);
+}
+
+// A deferred keybind's event, waiting to be delivered on the next tick
+struct PY_OBJECT_VISIBILITY DeferredKeyEvent {
+    std::shared_ptr<KeybindInfo> info;
+    FName key;
+    EInputEvent event;
+};
+
+// Only touched from the game thread. Swapped with the batch being delivered, so a callback which
+// causes more input can't invalidate it, and so neither reallocates under steady input.
+std::vector<DeferredKeyEvent> pending_key_events{};
+std::vector<DeferredKeyEvent> delivering_key_events{};
+
+// Must be called while holding the GIL
+void flush_deferred_keybinds() {
+    if (pending_key_events.empty()) {
+        return;
+    }
+
+    const GilHoldTimer gil_timer{};
+    delivering_key_events.swap(pending_key_events);
+    for (const auto& [info, key, event] : delivering_key_events) {
+        // A frame pushed since the event was queued suspends its keybinds, same as if it were live
+        if (info->removed || (info->frame != nullptr && info->frame->suspended)) {
+            continue;
+        }
+
+        try {
+            const CallTimer timer{info->stats};
+            call_keybind(
+                *info,
+                get_input_event(event),
+                (info->call_shape & CALL_WITH_KEY) != 0 ? get_key_name(key) : nullptr
+            );
+        } catch (const std::exception& ex) {
+            pyunrealsdk::logging::log_python_exception(ex);
+        }
+    }
+    delivering_key_events.clear();
+}
+
+void dispatch_key_events(
+    const DispatchTable& current,
+    const FName& key,
+    EInputEvent event,
+    bool is_gameplay
+) noexcept {
+    if (event >= IE_MAX) {
+        return;
+    }
+
+    const KeybindList& any_key_binds = current.any_key.get(is_gameplay, event);
+    const KeybindList* key_binds = nullptr;
+    if (auto it = current.by_key.find(key); it != current.by_key.end()) {
+        key_binds = &it->second.get(is_gameplay, event);
+    }
+
+    // Most events, mouse movement especially, have nothing to run; don't touch python for them
+    if (any_key_binds.empty() && (key_binds == nullptr || key_binds->empty())) {
+        return;
+    }
+
+    // Not taken at all if every match is deferred
+    LazyGil gil{};
+    PyObject* event_type = nullptr;
+    PyObject* key_str = nullptr;
+    for (const KeybindList* keybinds : {&any_key_binds, key_binds}) {
+        if (keybinds == nullptr) {
+            continue;
+        }
+
+        for (const std::shared_ptr<KeybindInfo>& info : *keybinds) {
+            // The snapshot may be stale, so it can still hold binds which were since removed
+            if (info->removed || (info->frame != nullptr && info->frame->suspended)) {
+                continue;
+            }
+
+            if (info->deferred) {
+                try {
+                    pending_key_events.push_back({.info = info, .key = key, .event = event});
+                } catch (const std::bad_alloc&) {
+                    // Dropped if it can't be queued, rather than throwing out of the input hook
+                }
+                continue;
+            }
+
+            gil.ensure();
+            if (event_type == nullptr) {
+                event_type = get_input_event(event);
+            }
+            if ((info->call_shape & CALL_WITH_KEY) != 0 && key_str == nullptr) {
+                key_str = get_key_name(key);
+            }
+
+            try {
+                const CallTimer timer{info->stats};
+                auto ret = call_keybind(*info, event_type, key_str);
+
+                // This only skips the callbacks in this chain not the games callbacks
+                if (pyunrealsdk::hooks::is_block_sentinel(ret)) {
+                    return;
+                }
+            } catch (const std::exception& ex) {
+                pyunrealsdk::logging::log_python_exception(ex);
+            }
+        }
+    }
+}
+
+// ############################################################################//
+//  | AXIS EVENTS |
+// ############################################################################//
+
+// Coalesced axis binds with a value waiting to be delivered on the next tick
+std::vector<std::pair<std::shared_ptr<AxisBindInfo>, FName>> pending_axes{};
+
+// Without a threshold every value but a repeated zero is let through, since delta axes such as
+// MouseX report the same value each frame while moving steadily. With one, a return to rest is
+// always let through so that releasing a stick reads as zero.
+bool axis_changed(float previous, float value, float threshold) {
+    if (threshold <= 0.0F) {
+        return value != 0.0F || previous != 0.0F;
+    }
+    if (value == previous) {
+        return false;
+    }
+    return value == 0.0F || std::abs(value - previous) >= threshold;
+}
+
+// Binds on specific keys have their states made when registered. Any key binds make them as keys
+// are first seen, if that fails the event is dropped rather than throwing out of the input hook.
+AxisState* find_axis_state(AxisBindInfo& info, const FName& key) noexcept {
+    if (auto it = info.states.find(key); it != info.states.end()) {
+        return &it->second;
+    }
+    try {
+        return &info.states[key];
+    } catch (const std::bad_alloc&) {
+        return nullptr;
+    }
+}
+
+void call_axis(AxisBindInfo& info, const FName& key, float value) {
+    const py::float_ py_value{value};
+
+    std::array<PyObject*, 3> args{};
+    size_t nargs = 0;
+    args[1 + nargs++] = py_value.ptr();
+    if ((info.call_shape & CALL_WITH_KEY) != 0) {
+        args[1 + nargs++] = get_key_name(key);
+    }
+
+    try {
+        const CallTimer timer{info.stats};
+        vectorcall(info.callback, args, nargs);
+    } catch (const std::exception& ex) {
+        pyunrealsdk::logging::log_python_exception(ex);
+    }
+}
+
+void dispatch_axis_events(
+    const DispatchTable& current,
+    const FName& key,
+    float value,
+    bool is_gameplay
+) noexcept {
+    const AxisList& any_key_axes = current.any_key.get_axes(is_gameplay);
+    const AxisList* key_axes = nullptr;
+    if (auto it = current.by_key.find(key); it != current.by_key.end()) {
+        key_axes = &it->second.get_axes(is_gameplay);
+    }
+
+    if (any_key_axes.empty() && (key_axes == nullptr || key_axes->empty())) {
+        return;
+    }
+
+    // Only taken once something actually needs to be delivered
+    LazyGil gil{};
+    for (const AxisList* axes : {&any_key_axes, key_axes}) {
+        if (axes == nullptr) {
+            continue;
+        }
+
+        for (const std::shared_ptr<AxisBindInfo>& info : *axes) {
+            if (info->removed) {
+                continue;
+            }
+
+            // Anything inside the dead zone is delivered as exactly zero
+            const float filtered = std::abs(value) < info->dead_zone ? 0.0F : value;
+            AxisState* state_ptr = find_axis_state(*info, key);
+            if (state_ptr == nullptr) {
+                continue;
+            }
+            AxisState& state = *state_ptr;
+
+            // Coalesced binds keep the latest value, and deliver it on the next tick
+            if (info->coalesce) {
+                if (!state.has_pending) {
+                    if (!axis_changed(state.delivered, filtered, info->threshold)) {
+                        continue;
+                    }
+                    state.has_pending = true;
+                    pending_axes.emplace_back(info, key);
+                }
+                state.pending = filtered;
+                continue;
+            }
+
+            if (!axis_changed(state.delivered, filtered, info->threshold)) {
+                continue;
+            }
+            state.delivered = filtered;
+
+            gil.ensure();
+            call_axis(*info, key, filtered);
+        }
+    }
+}
+
+// Must be called while holding the GIL
+void flush_pending_axes() {
+    for (const auto& [info, key] : pending_axes) {
+        // Always made before the bind was queued
+        AxisState& state = *find_axis_state(*info, key);
+        state.has_pending = false;
+
+        if (info->removed || !axis_changed(state.delivered, state.pending, info->threshold)) {
+            continue;
+        }
+        state.delivered = state.pending;
+        call_axis(*info, key, state.delivered);
+    }
+
+    // Keeps its capacity, so steady input doesn't allocate
+    pending_axes.clear();
+}
+
+// ############################################################################//
+//  | RECORDING |
+// ############################################################################//
+
+// A recording is this magic, a version, the key names it uses, then a flat array of events. Version
+// 1 stored the length of each key name in a single byte, 2 uses two.
+constexpr std::array<char, 4> RECORDING_MAGIC{'K', 'B', 'R', 'C'};
+constexpr uint16_t RECORDING_VERSION = 2;
+constexpr uint16_t RECORDING_VERSION_SHORT_NAMES = 1;
+
+// Buffering stops once either is reached, 64MiB of events is a little over an hour of busy input
+constexpr size_t MAX_RECORDED_EVENTS = 1 << 22;
+constexpr size_t MAX_RECORDED_KEYS = std::numeric_limits<uint16_t>::max();
+
+// Used in place of an input event to mark the end of a frame
+constexpr uint8_t RECORDED_TICK = 0xFF;
+
+constexpr uint8_t RECORDED_GAMEPAD = 1 << 0;
+constexpr uint8_t RECORDED_GAMEPLAY = 1 << 1;
+
+struct RecordedEvent {
+    uint64_t timestamp;  // Nanoseconds since the recording started
+    float amount;
+    uint16_t key;  // Index into the recording's key names
+    uint8_t event;
+    uint8_t flags;
+};
+static_assert(sizeof(RecordedEvent) == 16);
+
+struct Recording {
+    std::filesystem::path path;
+    Clock::time_point started;
+    std::vector<FName> keys;
+    std::unordered_map<FName, uint16_t> key_indexes;
+    std::vector<RecordedEvent> events;
+    bool full{};  // Set once buffering stopped early
 };
 
-pyunrealsdk::StaticPyObject input_event_enum = pyunrealsdk::unreal::enum_as_py_enum(
-    validate_type<UEnum>(unrealsdk::find_object(L"Enum", L"Core.Object.EInputEvent"))
-);
+// Events are only buffered while recording, the file is written in one go when it stops
+std::mutex recording_mutex;
+std::optional<Recording> recording;
+std::atomic<bool> recording_active{false};
+
+void record_event(const FName& key, uint8_t event, float amount, uint8_t flags) {
+    if (!recording_active.load(std::memory_order_relaxed)) {
+        return;
+    }
+
+    const std::scoped_lock lock{recording_mutex};
+    if (!recording.has_value()) {
+        return;
+    }
+
+    // Called from the input hook, so this must never throw. Once full, the rest of the input is
+    // dropped, but what's already buffered is still written when recording stops.
+    auto stop_buffering = []() {
+        recording->full = true;
+        recording_active = false;
+    };
+    if (recording->events.size() >= MAX_RECORDED_EVENTS) {
+        stop_buffering();
+        return;
+    }
+
+    try {
+        uint16_t key_index = 0;
+        if (event != RECORDED_TICK) {
+            auto it = recording->key_indexes.find(key);
+            if (it == recording->key_indexes.end()) {
+                if (recording->keys.size() >= MAX_RECORDED_KEYS) {
+                    stop_buffering();
+                    return;
+                }
+                auto index = static_cast<uint16_t>(recording->keys.size());
+                recording->keys.push_back(key);
+                it = recording->key_indexes.emplace(key, index).first;
+            }
+            key_index = it->second;
+        }
+
+        auto timestamp = std::chrono::duration_cast<std::chrono::nanoseconds>(
+            Clock::now() - recording->started
+        );
+        recording->events.push_back({
+            .timestamp = static_cast<uint64_t>(timestamp.count()),
+            .amount = amount,
+            .key = key_index,
+            .event = event,
+            .flags = flags,
+        });
+    } catch (const std::bad_alloc&) {
+        stop_buffering();
+    }
+}
+
+void record_tick() {
+    record_event({}, RECORDED_TICK, 0, 0);
+}
+
+template <typename T>
+void write_raw(std::ofstream& file, const T& value) {
+    file.write(reinterpret_cast<const char*>(&value), sizeof(T));
+}
+
+void write_recording(const Recording& finished) {
+    std::ofstream file{finished.path, std::ios::binary};
+    if (!file) {
+        throw std::runtime_error("Failed to open " + finished.path.string());
+    }
+
+    file.write(RECORDING_MAGIC.data(), RECORDING_MAGIC.size());
+    write_raw(file, RECORDING_VERSION);
+
+    write_raw(file, static_cast<uint16_t>(finished.keys.size()));
+    for (const auto& key : finished.keys) {
+        auto name = static_cast<std::string>(key);
+        if (name.size() > std::numeric_limits<uint16_t>::max()) {
+            throw std::runtime_error("Key name is too long to record: " + name.substr(0, 64));
+        }
+        write_raw(file, static_cast<uint16_t>(name.size()));
+        file.write(name.data(), static_cast<std::streamsize>(name.size()));
+    }
+
+    write_raw(file, static_cast<uint64_t>(finished.events.size()));
+    file.write(
+        reinterpret_cast<const char*>(finished.events.data()),
+        static_cast<std::streamsize>(finished.events.size() * sizeof(RecordedEvent))
+    );
+
+    if (!file) {
+        throw std::runtime_error("Failed to write " + finished.path.string());
+    }
+}
+
+// ############################################################################//
+//  | TICK |
+// ############################################################################//
+
+// Fired every frame, on the game thread, whether or not a level is loaded
+const char* const TICK_FUNC = "Engine.GameViewportClient:Tick";
+const char* const TICK_HOOK_ID = "__keybinds_tick";
+bool tick_hook_installed = false;
+
+void on_tick() {
+    flush_pending_axes();
+    flush_deferred_keybinds();
+    end_profiled_frame();
+
+    // Build anything registered this frame before the next frame's input needs it
+    refresh_dispatch_table();
+
+    // Readers are rarely active between frames, so this is when retired snapshots usually go; but
+    // never wait on a registration to do it
+    const std::unique_lock lock{registry_mutex, std::try_to_lock};
+    if (lock.owns_lock()) {
+        reclaim_snapshots();
+    }
+}
+
+// Only installed once something needs per frame work, so most setups never pay for it
+void ensure_tick_hook() {
+    if (tick_hook_installed) {
+        return;
+    }
+
+    const py::module_ hooks = py::module_::import("unrealsdk.hooks");
+    hooks.attr("add_hook")(
+        TICK_FUNC,
+        hooks.attr("Type").attr("PRE"),
+        TICK_HOOK_ID,
+        py::cpp_function([](const py::args& /*args*/) {
+            record_tick();
+            on_tick();
+        })
+    );
+    tick_hook_installed = true;
+}
+
+// ############################################################################//
+//  | BLOCK RULES |
+// ############################################################################//
+
+bool is_blocked(
+    const DispatchTable& current,
+    const FName& key,
+    EInputEvent event,
+    bool is_gameplay
+) {
+    if (event >= IE_MAX) {
+        return false;
+    }
+
+    auto any_enabled = [](const BlockRuleList& rules) {
+        return std::ranges::any_of(rules, [](const std::shared_ptr<BlockRule>& rule) {
+            return rule->enabled.load(std::memory_order_relaxed);
+        });
+    };
+
+    if (any_enabled(current.any_key.get_block_rules(is_gameplay, event))) {
+        return true;
+    }
+    auto it = current.by_key.find(key);
+    return it != current.by_key.end()
+           && any_enabled(it->second.get_block_rules(is_gameplay, event));
+}
+
+// ############################################################################//
+//  | KEY STATE |
+// ############################################################################//
+
+// Updated from the input hook but may be queried from any thread. A key is down while it has an
+// entry, which holds when it was pressed.
+std::mutex key_state_mutex{};
+std::array<std::unordered_map<FName, Clock::time_point>, 2> keys_down_by_context{};
+
+void update_key_state(const FName& key, EInputEvent event, bool is_gameplay) noexcept {
+    if (event != IE_Pressed && event != IE_Released) {
+        return;
+    }
+
+    const std::scoped_lock lock{key_state_mutex};
+    if (event == IE_Pressed) {
+        try {
+            keys_down_by_context[is_gameplay ? 1 : 0].try_emplace(key, Clock::now());
+        } catch (const std::bad_alloc&) {
+            // The key just isn't tracked as held, rather than throwing out of the input hook
+        }
+        return;
+    }
+
+    // A key pressed in one context can be released in the other, e.g. when a menu opens
+    for (auto& keys_down : keys_down_by_context) {
+        keys_down.erase(key);
+    }
+}
+
+std::optional<Clock::time_point> find_press_time(
+    const FName& key,
+    std::optional<bool> is_gameplay
+) {
+    const std::scoped_lock lock{key_state_mutex};
+    std::optional<Clock::time_point> pressed_at{};
+    for (size_t context = 0; context < keys_down_by_context.size(); ++context) {
+        if (is_gameplay.has_value() && *is_gameplay != (context == 1)) {
+            continue;
+        }
+        if (auto it = keys_down_by_context[context].find(key);
+            it != keys_down_by_context[context].end()) {
+            pressed_at = std::min(pressed_at.value_or(it->second), it->second);
+        }
+    }
+    return pressed_at;
+}
+
+bool is_key_down(const FName& key, std::optional<bool> is_gameplay) {
+    return find_press_time(key, is_gameplay).has_value();
+}
+
+std::optional<double> key_held_time(const FName& key, std::optional<bool> is_gameplay) {
+    auto pressed_at = find_press_time(key, is_gameplay);
+    if (!pressed_at.has_value()) {
+        return std::nullopt;
+    }
+    return std::chrono::duration<double>(Clock::now() - *pressed_at).count();
+}
+
+std::vector<FName> keys_down(std::optional<bool> is_gameplay) {
+    const std::scoped_lock lock{key_state_mutex};
+    std::vector<FName> keys{};
+    for (size_t context = 0; context < keys_down_by_context.size(); ++context) {
+        if (is_gameplay.has_value() && *is_gameplay != (context == 1)) {
+            continue;
+        }
+        for (const auto& [key, _] : keys_down_by_context[context]) {
+            if (std::ranges::find(keys, key) == keys.end()) {
+                keys.push_back(key);
+            }
+        }
+    }
+    return keys;
+}
+
+// ############################################################################//
+//  | CHORDS AND SEQUENCES |
+// ############################################################################//
+
+// Either side counts for the standard modifiers
+struct StandardModifier {
+    std::string_view name;
+    std::array<const wchar_t*, 2> keys;
+};
+constexpr std::array<StandardModifier, 3> STANDARD_MODIFIERS{{
+    {"ctrl", {L"LeftControl", L"RightControl"}},
+    {"shift", {L"LeftShift", L"RightShift"}},
+    {"alt", {L"LeftAlt", L"RightAlt"}},
+}};
+
+bool is_any_key_down(const std::vector<FName>& keys) {
+    return std::ranges::any_of(keys, [](const FName& key) {
+        return is_key_down(key, std::nullopt);
+    });
+}
+
+const std::vector<FName>& standard_modifier_keys(size_t index) {
+    static const std::array<std::vector<FName>, STANDARD_MODIFIERS.size()> keys = []() {
+        std::array<std::vector<FName>, STANDARD_MODIFIERS.size()> names{};
+        for (size_t i = 0; i < STANDARD_MODIFIERS.size(); ++i) {
+            for (const wchar_t* name : STANDARD_MODIFIERS[i].keys) {
+                names[i].emplace_back(std::wstring{name});
+            }
+        }
+        return names;
+    }();
+    return keys[index];
+}
+
+// Standard modifiers which aren't part of the chord must not be held, so Ctrl+Shift+F5 doesn't
+// also trigger Ctrl+F5
+bool chord_matches(const ChordInfo& chord) {
+    for (size_t i = 0; i < STANDARD_MODIFIERS.size(); ++i) {
+        if ((chord.standard_modifiers & (1 << i)) == 0
+            && is_any_key_down(standard_modifier_keys(i))) {
+            return false;
+        }
+    }
+    return std::ranges::all_of(chord.modifiers, is_any_key_down);
+}
+
+std::vector<size_t> sequence_fallback(const std::vector<FName>& keys) {
+    std::vector<size_t> fallback(keys.size(), 0);
+    size_t matched = 0;
+    for (size_t i = 1; i < keys.size(); ++i) {
+        while (matched > 0 && keys[i] != keys[matched]) {
+            matched = fallback[matched - 1];
+        }
+        if (keys[i] == keys[matched]) {
+            ++matched;
+        }
+        fallback[i] = matched;
+    }
+    return fallback;
+}
+
+// Returns true if the sequence just completed
+bool advance_sequence(SequenceInfo& sequence, const FName& key, Clock::time_point now) {
+    const size_t length = sequence.keys.size();
+    sequence.press_times[sequence.presses++ % length] = now;
+
+    // Same as KMP string search, on a wrong key fall back to the longest attempt which still fits,
+    // so that A, A, A, B completes A, A, B
+    size_t progress = sequence.progress;
+    while (progress > 0 && sequence.keys[progress] != key) {
+        progress = sequence.fallback[progress - 1];
+    }
+    if (sequence.keys[progress] == key) {
+        ++progress;
+    }
+
+    // Then keep falling back until the attempt started within the time limit
+    auto started_at = [&sequence, length](size_t attempt) {
+        return sequence.press_times[(sequence.presses - attempt) % length];
+    };
+    while (progress > 0 && now - started_at(progress) > sequence.timeout) {
+        progress = sequence.fallback[progress - 1];
+    }
+
+    if (progress < length) {
+        sequence.progress = progress;
+        return false;
+    }
+    sequence.progress = 0;
+    return true;
+}
+
+// Returns true if a callback blocked the rest of the chain, which includes the regular keybinds
+bool dispatch_chords_and_sequences(
+    const DispatchTable& current,
+    const FName& key,
+    EInputEvent event,
+    bool is_gameplay
+) noexcept {
+    if (event >= IE_MAX) {
+        return false;
+    }
+
+    const size_t context = is_gameplay ? 1 : 0;
+
+    const ChordList* chords = nullptr;
+    if (auto it = current.by_key.find(key); it != current.by_key.end()) {
+        chords = &it->second.chords[context];
+    }
+    const SequenceList& sequences = current.sequences[context];
+
+    if ((chords == nullptr || chords->empty()) && (event != IE_Pressed || sequences.empty())) {
+        return false;
+    }
+
+    LazyGil gil{};
+    bool blocked = false;
+    auto call = [&gil, &blocked](const py::object& callback, CallStats& stats, PyObject* arg) {
+        gil.ensure();
+
+        std::array<PyObject*, 2> args{nullptr, arg};
+        try {
+            const CallTimer timer{stats};
+            auto ret = vectorcall(callback, args, arg == nullptr ? 0 : 1);
+
+            // Same as regular keybinds, this only skips the rest of the chain
+            blocked = pyunrealsdk::hooks::is_block_sentinel(ret);
+        } catch (const std::exception& ex) {
+            pyunrealsdk::logging::log_python_exception(ex);
+        }
+    };
+
+    if (chords != nullptr) {
+        for (const std::shared_ptr<ChordInfo>& chord : *chords) {
+            if (!chord->removed && (chord->events & event_bit(event)) != 0
+                && chord_matches(*chord)) {
+                call(
+                    chord->callback,
+                    chord->stats,
+                    (chord->call_shape & CALL_WITH_EVENT) != 0 ? get_input_event(event) : nullptr
+                );
+                if (blocked) {
+                    return true;
+                }
+            }
+        }
+    }
+
+    if (event == IE_Pressed) {
+        const Clock::time_point now = Clock::now();
+        for (const std::shared_ptr<SequenceInfo>& sequence : sequences) {
+            if (sequence->removed) {
+                continue;
+            }
+
+            // Every sequence still sees the press after one blocks, only the callbacks are skipped
+            if (advance_sequence(*sequence, key, now) && !blocked) {
+                call(sequence->callback, sequence->stats, nullptr);
+            }
+        }
+    }
+    return blocked;
+}
+
+// ############################################################################//
+//  | REGISTRATION |
+// ############################################################################//
+
+// Requires the registry lock
+std::shared_ptr<KeybindFrame> find_frame(size_t id) {
+    for (const std::shared_ptr<KeybindFrame>& frame : frame_stack) {
+        if (frame->id == id) {
+            return frame;
+        }
+    }
+    throw py::value_error("keybind frame " + std::to_string(id) + " is no longer on the stack");
+}
+
+EventMask validate_event(EInputEvent event) {
+    if (event >= IE_MAX) {
+        throw py::value_error("invalid input event " + std::to_string(event));
+    }
+    return event_bit(event);
+}
+
+// Accepts None for any key, a single key, or an iterable of keys
+std::vector<FName> keys_from_py(const py::object& key) {
+    if (key.is_none()) {
+        return {};
+    }
+    if (py::isinstance<py::str>(key)) {
+        return {py::cast<FName>(key)};
+    }
+
+    std::vector<FName> keys{};
+    for (const py::handle item : key) {
+        auto name = py::cast<FName>(item);
+        if (std::ranges::find(keys, name) == keys.end()) {
+            keys.push_back(name);
+        }
+    }
+    if (keys.empty()) {
+        throw py::value_error("key set must not be empty");
+    }
+    return keys;
+}
+
+KeybindHandle register_keybind(
+    const py::object& key,
+    const std::optional<EInputEvent>& filter,
+    bool is_gameplay_bind,
+    const py::object& callback,
+    std::optional<size_t> frame_id,
+    std::optional<EventMask> event_mask,
+    bool deferred
+) {
+    EventMask events = ALL_EVENTS;
+    if (filter.has_value()) {
+        if (event_mask.has_value()) {
+            throw py::value_error("cannot give both a filter and an event mask");
+        }
+        events = validate_event(*filter);
+    } else if (event_mask.has_value()) {
+        events = *event_mask & ALL_EVENTS;
+        if (events == 0) {
+            throw py::value_error("event mask must include at least one event");
+        }
+    }
+
+    std::vector<FName> keys = keys_from_py(key);
+
+    // Anything which may match more than one key or event needs to be told which it was
+    CallShape call_shape = CALL_NO_ARGS;
+    if (!filter.has_value()) {
+        call_shape |= CALL_WITH_EVENT;
+    }
+    if (!py::isinstance<py::str>(key)) {
+        call_shape |= CALL_WITH_KEY;
+    }
+
+    if (deferred) {
+        ensure_tick_hook();
+    }
+
+    const RegistryLock lock{};
+
+    std::shared_ptr<KeybindFrame> frame{};
+    if (frame_id.has_value()) {
+        frame = find_frame(*frame_id);
+    }
+
+    std::shared_ptr<KeybindInfo> info{
+        new KeybindInfo{
+            callback,
+            std::move(keys),
+            events,
+            is_gameplay_bind,
+            call_shape,
+            deferred,
+            next_keybind_order++,
+            frame,
+        },
+        GilDeleter{}
+    };
+
+    KeybindHandle handle = info.get();
+    keybinds_by_handle.emplace(handle, std::move(info));
+    if (frame != nullptr) {
+        frame->keybinds.insert(handle);
+    }
+    invalidate_dispatch_table();
+    return handle;
+}
+
+KeybindHandle register_axis(
+    const py::object& key,
+    bool is_gameplay_bind,
+    const py::object& callback,
+    float dead_zone,
+    float threshold,
+    bool coalesce
+) {
+    if (dead_zone < 0 || threshold < 0) {
+        throw py::value_error("dead zone and threshold must not be negative");
+    }
+
+    std::shared_ptr<AxisBindInfo> info{
+        new AxisBindInfo{
+            .callback = callback,
+            .keys = keys_from_py(key),
+            .is_gameplay = is_gameplay_bind,
+            .call_shape = py::isinstance<py::str>(key) ? CALL_NO_ARGS : CALL_WITH_KEY,
+            .order = next_keybind_order++,
+            .dead_zone = dead_zone,
+            .threshold = threshold,
+            .coalesce = coalesce,
+        },
+        GilDeleter{}
+    };
+    // Not visible to the input hook yet, so this is the one place states can be made off its thread
+    info->states.reserve(info->keys.size());
+    for (const FName& bound_key : info->keys) {
+        info->states.try_emplace(bound_key);
+    }
+
+    if (coalesce) {
+        ensure_tick_hook();
+    }
 
-const FName ANY_KEY{0, 0};
-std::unordered_multimap<FName, std::shared_ptr<KeybindInfo>> callback_map{};
+    KeybindHandle handle = info.get();
+    const RegistryLock lock{};
+    axes_by_handle.emplace(handle, std::move(info));
+    invalidate_dispatch_table();
+    return handle;
+}
 
-// ############################################################################//
-//  | DISPATCH KEY EVENTS |
-// ############################################################################//
+KeybindHandle add_block_rule(
+    const py::object& key,
+    std::optional<EventMask> event_mask,
+    std::optional<bool> is_gameplay_bind,
+    bool enabled
+) {
+    auto rule = std::make_shared<BlockRule>(
+        keys_from_py(key),
+        static_cast<EventMask>(event_mask.value_or(ALL_EVENTS) & ALL_EVENTS),
+        is_gameplay_bind,
+        enabled
+    );
 
-void dispatch_key_events(const FName& key, EInputEvent event, bool is_gameplay) noexcept {
-    using ElemType = std::shared_ptr<KeybindInfo>;
-    std::vector<ElemType> keybinds{};
+    KeybindHandle handle = rule.get();
+    const RegistryLock lock{};
+    block_rules_by_handle.emplace(handle, std::move(rule));
+    invalidate_dispatch_table();
+    return handle;
+}
 
-    // Copy into vector
-    auto copy_keybinds = [&keybinds, is_gameplay, event](const FName& key) {
-        auto [it, end] = callback_map.equal_range(key);
-        for (; it != end; ++it) {
-            const ElemType& info = it->second;
+void set_block_rule_enabled(KeybindHandle handle, bool enabled) {
+    const RegistryLock lock{};
+    auto it = block_rules_by_handle.find(handle);
+    if (it == block_rules_by_handle.end()) {
+        throw py::key_error("unknown block rule");
+    }
+    it->second->enabled.store(enabled, std::memory_order_relaxed);
+}
 
-            if (is_gameplay != info->is_gameplay) {
-                continue;
-            }
-            if (info->filter.has_value() && *info->filter != event) {
-                continue;
-            }
+KeybindHandle register_chord(
+    const py::iterable& modifiers,
+    const FName& key,
+    bool is_gameplay_bind,
+    const py::object& callback,
+    std::optional<EInputEvent> filter
+) {
+    std::shared_ptr<ChordInfo> info{
+        new ChordInfo{
+            .callback = callback,
+            .modifiers = {},
+            .standard_modifiers = 0,
+            .key = key,
+            .events = filter.has_value() ? validate_event(*filter) : ALL_EVENTS,
+            .is_gameplay = is_gameplay_bind,
+            .call_shape = filter.has_value() ? CALL_NO_ARGS : CALL_WITH_EVENT,
+            .order = next_keybind_order++,
+        },
+        GilDeleter{}
+    };
 
-            keybinds.push_back(it->second);
+    for (const py::handle modifier : modifiers) {
+        std::string name = py::cast<std::string>(modifier);
+        std::ranges::transform(name, name.begin(), [](unsigned char chr) {
+            return static_cast<char>(std::tolower(chr));
+        });
+
+        auto standard = std::ranges::find(STANDARD_MODIFIERS, name, &StandardModifier::name);
+        if (standard == STANDARD_MODIFIERS.end()) {
+            info->modifiers.push_back({py::cast<FName>(modifier)});
+            continue;
         }
+
+        auto index = std::distance(STANDARD_MODIFIERS.begin(), standard);
+        info->standard_modifiers |= 1 << index;
+        info->modifiers.push_back(standard_modifier_keys(index));
+    }
+    if (info->modifiers.empty()) {
+        throw py::value_error("a chord needs at least one modifier");
+    }
+
+    KeybindHandle handle = info.get();
+    const RegistryLock lock{};
+    chords_by_handle.emplace(handle, std::move(info));
+    invalidate_dispatch_table();
+    return handle;
+}
+
+KeybindHandle register_sequence(
+    const std::vector<FName>& keys,
+    double timeout,
+    bool is_gameplay_bind,
+    const py::object& callback
+) {
+    if (keys.empty()) {
+        throw py::value_error("a sequence needs at least one key");
+    }
+    if (timeout <= 0) {
+        throw py::value_error("sequence timeout must be positive");
+    }
+
+    std::shared_ptr<SequenceInfo> info{
+        new SequenceInfo{
+            .callback = callback,
+            .keys = keys,
+            .timeout = std::chrono::duration_cast<Clock::duration>(
+                std::chrono::duration<double>(timeout)
+            ),
+            .is_gameplay = is_gameplay_bind,
+            .order = next_keybind_order++,
+            .fallback = sequence_fallback(keys),
+            .progress = 0,
+            .presses = 0,
+            .press_times = std::vector<Clock::time_point>(keys.size()),
+        },
+        GilDeleter{}
     };
-    copy_keybinds(ANY_KEY);
-    copy_keybinds(key);
 
-    // Skip
-    if (keybinds.empty()) {
-        return;
+    KeybindHandle handle = info.get();
+    const RegistryLock lock{};
+    sequences_by_handle.emplace(handle, std::move(info));
+    invalidate_dispatch_table();
+    return handle;
+}
+
+// Requires the registry lock. Returns true if anything was removed.
+bool remove_handle(KeybindHandle handle) {
+    // Flag everything as it's removed, a stale dispatch snapshot may still be holding onto it
+    if (auto rule = block_rules_by_handle.find(handle); rule != block_rules_by_handle.end()) {
+        rule->second->enabled = false;
+        block_rules_by_handle.erase(rule);
+        return true;
+    }
+    if (auto chord = chords_by_handle.find(handle); chord != chords_by_handle.end()) {
+        chord->second->removed = true;
+        chords_by_handle.erase(chord);
+        return true;
+    }
+    if (auto sequence = sequences_by_handle.find(handle); sequence != sequences_by_handle.end()) {
+        sequence->second->removed = true;
+        sequences_by_handle.erase(sequence);
+        return true;
     }
 
-    const py::gil_scoped_acquire gil{};
-    py::object block_signal{};
-    py::object event_type;
-    py::object key_str;
-    for (const std::shared_ptr<KeybindInfo>& info : keybinds) {
-        py::list args{};
+    if (auto axis = axes_by_handle.find(handle); axis != axes_by_handle.end()) {
+        axis->second->removed = true;
+        axes_by_handle.erase(axis);
+        return true;
+    }
 
-        // If there is an event filter append the event arg
-        if (!info->filter.has_value()) {
-            if (!event_type) {
-                event_type = input_event_enum(event);
-            }
-            args.append(event_type);
+    auto it = keybinds_by_handle.find(handle);
+    if (it == keybinds_by_handle.end()) {
+        return false;
+    }
+
+    if (it->second->frame != nullptr) {
+        it->second->frame->keybinds.erase(handle);
+    }
+    it->second->removed = true;
+    keybinds_by_handle.erase(it);
+    return true;
+}
+
+void deregister_keybind(KeybindHandle handle) {
+    const RegistryLock lock{};
+    if (remove_handle(handle)) {
+        invalidate_dispatch_table();
+    }
+}
+
+void deregister_many(const std::vector<KeybindHandle>& handles) {
+    const RegistryLock lock{};
+    bool removed = false;
+    for (KeybindHandle handle : handles) {
+        removed |= remove_handle(handle);
+    }
+    if (removed) {
+        invalidate_dispatch_table();
+    }
+}
+
+void deregister_by_key(const FName& key) {
+    const RegistryLock lock{};
+
+    std::vector<KeybindHandle> handles{};
+    for (const auto& [handle, info] : keybinds_by_handle) {
+        if (std::ranges::find(info->keys, key) != info->keys.end()) {
+            handles.push_back(handle);
+        }
+    }
+    for (const auto& [handle, info] : axes_by_handle) {
+        if (std::ranges::find(info->keys, key) != info->keys.end()) {
+            handles.push_back(handle);
+        }
+    }
+    for (const auto& [handle, rule] : block_rules_by_handle) {
+        if (std::ranges::find(rule->keys, key) != rule->keys.end()) {
+            handles.push_back(handle);
         }
+    }
+    for (const auto& [handle, info] : chords_by_handle) {
+        if (info->key == key) {
+            handles.push_back(handle);
+        }
+    }
+    for (const auto& [handle, info] : sequences_by_handle) {
+        if (std::ranges::find(info->keys, key) != info->keys.end()) {
+            handles.push_back(handle);
+        }
+    }
 
-        // If any key then append the key string
-        if (info->is_any_key) {
-            if (!key_str) {
-                key_str = py::str(std::string(key));
-            }
-            args.append(key_str);
+    for (KeybindHandle handle : handles) {
+        remove_handle(handle);
+    }
+    if (!handles.empty()) {
+        invalidate_dispatch_table();
+    }
+}
+
+void deregister_all() {
+    const RegistryLock lock{};
+
+    for (const auto& [_, info] : keybinds_by_handle) {
+        info->removed = true;
+    }
+    keybinds_by_handle.clear();
+    for (const auto& [_, info] : axes_by_handle) {
+        info->removed = true;
+    }
+    axes_by_handle.clear();
+    for (const auto& [_, rule] : block_rules_by_handle) {
+        rule->enabled = false;
+    }
+    block_rules_by_handle.clear();
+    for (const auto& [_, info] : chords_by_handle) {
+        info->removed = true;
+    }
+    chords_by_handle.clear();
+    for (const auto& [_, info] : sequences_by_handle) {
+        info->removed = true;
+    }
+    sequences_by_handle.clear();
+    for (const std::shared_ptr<KeybindFrame>& frame : frame_stack) {
+        frame->keybinds.clear();
+    }
+    invalidate_dispatch_table();
+}
+
+// ############################################################################//
+//  | FRAMES |
+// ############################################################################//
+
+size_t push_frame() {
+    const RegistryLock lock{};
+
+    if (!frame_stack.empty()) {
+        frame_stack.back()->suspended = true;
+    }
+
+    auto frame = std::make_shared<KeybindFrame>();
+    frame->id = next_frame_id++;
+    frame_stack.push_back(frame);
+
+    invalidate_dispatch_table();
+    return frame->id;
+}
+
+void pop_frame() {
+    const RegistryLock lock{};
+
+    if (frame_stack.empty()) {
+        throw py::index_error("pop from empty keybind frame stack");
+    }
+
+    const std::shared_ptr<KeybindFrame> frame = std::move(frame_stack.back());
+    frame_stack.pop_back();
+    for (KeybindHandle handle : frame->keybinds) {
+        if (auto it = keybinds_by_handle.find(handle); it != keybinds_by_handle.end()) {
+            it->second->removed = true;
+            keybinds_by_handle.erase(it);
         }
+    }
+    frame->keybinds.clear();
+
+    if (!frame_stack.empty()) {
+        frame_stack.back()->suspended = false;
+    }
+    invalidate_dispatch_table();
+}
+
+// ############################################################################//
+//  | STATS |
+// ############################################################################//
+
+double to_seconds(Clock::duration duration) {
+    return std::chrono::duration<double>(duration).count();
+}
 
-        // Call the callback
-        auto ret = info->callback(*args);
+void set_profiling(bool enabled) {
+    if (enabled) {
+        // Needed to split the GIL time into frames
+        ensure_tick_hook();
+    }
+    profiling_enabled = enabled;
+    gil_time_this_frame = {};
+}
 
-        // This only skips the callbacks in this chain not the games callbacks
-        if (pyunrealsdk::hooks::is_block_sentinel(ret)) {
+py::list get_callback_stats() {
+    const RegistryLock lock{};
+
+    py::list snapshot{};
+    auto add = [&snapshot](const char* kind, const py::object& callback, const CallStats& stats) {
+        if (stats.calls == 0) {
             return;
         }
+        snapshot.append(py::dict(
+            "kind"_a = kind,
+            "callback"_a = callback,
+            "calls"_a = stats.calls,
+            "total"_a = to_seconds(stats.total),
+            "max"_a = to_seconds(stats.max),
+            "histogram"_a = stats.histogram
+        ));
+    };
+
+    for (const auto& info : sorted_by_order(keybinds_by_handle)) {
+        add("keybind", info->callback, info->stats);
+    }
+    for (const auto& info : sorted_by_order(axes_by_handle)) {
+        add("axis", info->callback, info->stats);
+    }
+    for (const auto& info : sorted_by_order(chords_by_handle)) {
+        add("chord", info->callback, info->stats);
+    }
+    for (const auto& info : sorted_by_order(sequences_by_handle)) {
+        add("sequence", info->callback, info->stats);
+    }
+    return snapshot;
+}
+
+py::dict get_frame_stats() {
+    return py::dict(
+        "frames"_a = frame_stats.frames,
+        "total"_a = to_seconds(frame_stats.total),
+        "max"_a = to_seconds(frame_stats.max),
+        "last"_a = to_seconds(frame_stats.last)
+    );
+}
+
+void reset_stats() {
+    const RegistryLock lock{};
+
+    for (const auto& [_, info] : keybinds_by_handle) {
+        info->stats = {};
+    }
+    for (const auto& [_, info] : axes_by_handle) {
+        info->stats = {};
     }
+    for (const auto& [_, info] : chords_by_handle) {
+        info->stats = {};
+    }
+    for (const auto& [_, info] : sequences_by_handle) {
+        info->stats = {};
+    }
+    frame_stats = {};
+    gil_time_this_frame = {};
 }
 
 // ############################################################################//
@@ -132,6 +1766,27 @@ typedef void*(__fastcall* on_input_event_func)(
 
 on_input_event_func input_func_ptr{nullptr};
 
+// Everything keybinds do with an input event, returns true if the game shouldn't see it
+bool dispatch_input(const FName& key, EInputEvent event, float amount, bool is_gameplay) {
+    update_key_state(key, event, is_gameplay);
+
+    // Callbacks may change the registrations, everything sees the same snapshot regardless
+    refresh_dispatch_table();
+    const SnapshotReader current{};
+
+    // Keybinds still see blocked input, only the game doesn't
+    const bool blocked = is_blocked(*current, key, event, is_gameplay);
+
+    if (event == IE_Axis) {
+        dispatch_axis_events(*current, key, amount, is_gameplay);
+    }
+    if (!dispatch_chords_and_sequences(*current, key, event, is_gameplay)) {
+        dispatch_key_events(*current, key, event, is_gameplay);
+    }
+
+    return blocked;
+}
+
 void* __fastcall hook_input_func(
     UObject* ecx,
     void* edx,
@@ -147,14 +1802,26 @@ void* __fastcall hook_input_func(
     // static UObject* ui_input_class = unreal::find_class(L"WillowGame.WillowConsole");
 
     bool is_gameplay = ecx->Class == gameplay_input_class;
-    dispatch_key_events(key, event, is_gameplay);
+    record_event(
+        key,
+        event,
+        amount_depressed,
+        (is_gamepad ? RECORDED_GAMEPAD : 0) | (is_gameplay ? RECORDED_GAMEPLAY : 0)
+    );
+
+    // This is the eventInputKey thunk, which returns a UBOOL of whether the key was handled. Report
+    // blocked input as handled, otherwise the viewport passes it on to the remaining interactions.
+    if (dispatch_input(key, event, amount_depressed, is_gameplay)) {
+        return reinterpret_cast<void*>(static_cast<uintptr_t>(1));
+    }
 
     // idk what this returns; seems to be 0x0 most of the time
     return input_func_ptr(ecx, edx, controller, key, event, amount_depressed, is_gamepad);
 }
 
 // probably not a bitcoin miner
-Pattern<80> INPUT_FUN_SIG{
+constexpr size_t INPUT_FUN_SIG_SIZE = 80;
+Pattern<INPUT_FUN_SIG_SIZE> INPUT_FUN_SIG{
     "83 EC 1C"
     "8B 44 24 20"
     "8B 54 24 24"
@@ -180,6 +1847,313 @@ Pattern<80> INPUT_FUN_SIG{
 };
 
 }  // namespace
+
+// ############################################################################//
+//  | REPLAY |
+// ############################################################################//
+
+void start_recording(const std::filesystem::path& path) {
+    // Frame boundaries are recorded from the tick hook, so replays can flush coalesced axes and
+    // collect per frame stats same as live
+    ensure_tick_hook();
+
+    const std::scoped_lock lock{recording_mutex};
+    if (recording.has_value()) {
+        throw std::runtime_error("Already recording to " + recording->path.string());
+    }
+
+    recording.emplace();
+    recording->path = path;
+    recording->started = Clock::now();
+    recording->events.reserve(1 << 16);
+    recording_active = true;
+}
+
+size_t stop_recording() {
+    std::optional<Recording> finished{};
+    {
+        const std::scoped_lock lock{recording_mutex};
+        recording_active = false;
+        finished.swap(recording);
+    }
+    if (!finished.has_value()) {
+        throw std::runtime_error("Not recording");
+    }
+
+    {
+        const py::gil_scoped_release gil{};
+        write_recording(*finished);
+    }
+
+    if (finished->full) {
+        py::module_::import("unrealsdk.logging")
+            .attr("warning")(
+                "Input recording " + finished->path.string()
+                + " filled up before it was stopped; later input was not recorded"
+            );
+    }
+    return finished->events.size();
+}
+
+template <typename T>
+T read_raw(std::ifstream& file) {
+    T value{};
+    file.read(reinterpret_cast<char*>(&value), sizeof(T));
+    return value;
+}
+
+std::pair<std::vector<FName>, std::vector<RecordedEvent>> read_recording(
+    const std::filesystem::path& path
+) {
+    std::ifstream file{path, std::ios::binary};
+    if (!file) {
+        throw std::runtime_error("Failed to open " + path.string());
+    }
+
+    std::array<char, RECORDING_MAGIC.size()> magic{};
+    file.read(magic.data(), magic.size());
+    auto version = read_raw<uint16_t>(file);
+    if (magic != RECORDING_MAGIC
+        || (version != RECORDING_VERSION && version != RECORDING_VERSION_SHORT_NAMES)) {
+        throw std::runtime_error(path.string() + " is not a supported keybind recording");
+    }
+
+    std::vector<FName> keys(read_raw<uint16_t>(file));
+    for (auto& key : keys) {
+        std::string name(
+            version == RECORDING_VERSION_SHORT_NAMES ? read_raw<uint8_t>(file)
+                                                     : read_raw<uint16_t>(file),
+            '\0'
+        );
+        file.read(name.data(), static_cast<std::streamsize>(name.size()));
+        key = FName{name};
+    }
+
+    std::vector<RecordedEvent> events(read_raw<uint64_t>(file));
+    file.read(
+        reinterpret_cast<char*>(events.data()),
+        static_cast<std::streamsize>(events.size() * sizeof(RecordedEvent))
+    );
+    if (!file) {
+        throw std::runtime_error(path.string() + " is truncated");
+    }
+
+    for (const auto& recorded : events) {
+        if (recorded.event != RECORDED_TICK && recorded.key >= keys.size()) {
+            throw std::runtime_error(path.string() + " references an unknown key");
+        }
+    }
+
+    return {std::move(keys), std::move(events)};
+}
+
+// Everything dispatch changes as input arrives. Saved before a replay and put back after, so keys
+// held when it ends aren't left down, and live sequences and axes carry on where they were. Must be
+// created and destroyed while holding the GIL.
+class PY_OBJECT_VISIBILITY SavedDispatchState {
+    struct SequenceState {
+        std::shared_ptr<SequenceInfo> info;
+        size_t progress;
+        size_t presses;
+        std::vector<Clock::time_point> press_times;
+    };
+
+    std::array<std::unordered_map<FName, Clock::time_point>, 2> keys_down;
+    std::vector<std::pair<std::shared_ptr<AxisBindInfo>, std::unordered_map<FName, AxisState>>>
+        axes;
+    std::vector<SequenceState> sequences;
+    std::vector<std::pair<std::shared_ptr<AxisBindInfo>, FName>> axes_pending;
+    std::vector<DeferredKeyEvent> key_events_pending;
+
+   public:
+    SavedDispatchState() {
+        {
+            const std::scoped_lock lock{key_state_mutex};
+            keys_down = keys_down_by_context;
+        }
+
+        const RegistryLock lock{};
+        for (const auto& [_, info] : axes_by_handle) {
+            axes.emplace_back(info, info->states);
+        }
+        for (const auto& [_, info] : sequences_by_handle) {
+            sequences.push_back({info, info->progress, info->presses, info->press_times});
+        }
+        axes_pending = pending_axes;
+        key_events_pending = pending_key_events;
+    }
+
+    ~SavedDispatchState() {
+        {
+            const std::scoped_lock lock{key_state_mutex};
+            keys_down_by_context = std::move(keys_down);
+        }
+
+        // Binds registered during the replay are left as they are
+        const RegistryLock lock{};
+        for (auto& [info, states] : axes) {
+            info->states = std::move(states);
+        }
+        for (auto& sequence : sequences) {
+            sequence.info->progress = sequence.progress;
+            sequence.info->presses = sequence.presses;
+            sequence.info->press_times = std::move(sequence.press_times);
+        }
+        pending_axes = std::move(axes_pending);
+        pending_key_events = std::move(key_events_pending);
+    }
+
+    SavedDispatchState(const SavedDispatchState&) = delete;
+    SavedDispatchState& operator=(const SavedDispatchState&) = delete;
+};
+
+// Runs a recording through the same dispatch as live input, without the game ever seeing it.
+// Returns the number of input events dispatched and how long it took.
+//
+// Must be called from the game thread, since dispatch state is only ever touched from it. That
+// means a realtime replay blocks the game until it's finished.
+std::pair<size_t, double> replay_recording(const std::filesystem::path& path, bool realtime) {
+    auto [keys, events] = read_recording(path);
+    const SavedDispatchState saved{};
+
+    // Same as live input, only take the GIL when something needs python
+    const py::gil_scoped_release gil{};
+
+    size_t dispatched = 0;
+    auto start = Clock::now();
+    for (const auto& recorded : events) {
+        if (realtime) {
+            std::this_thread::sleep_until(start + std::chrono::nanoseconds{recorded.timestamp});
+        }
+
+        if (recorded.event == RECORDED_TICK) {
+            const py::gil_scoped_acquire tick_gil{};
+            on_tick();
+            continue;
+        }
+
+        dispatch_input(
+            keys[recorded.key],
+            recorded.event,
+            recorded.amount,
+            (recorded.flags & RECORDED_GAMEPLAY) != 0
+        );
+        dispatched++;
+    }
+
+    return {dispatched, std::chrono::duration<double>(Clock::now() - start).count()};
+}
+
+// ############################################################################//
+//  | SIGSCAN CACHE |
+// ############################################################################//
+
+// The link timestamp from the exe's PE header, which changes with every build of the game
+uint32_t exe_timestamp(uintptr_t base) {
+    // e_lfanew, the offset of the PE header from the start of the DOS header
+    constexpr uintptr_t PE_HEADER_OFFSET_FIELD = 0x3C;
+    // Past the 'PE\0\0' signature, the machine type and the section count
+    constexpr uintptr_t TIMESTAMP_FIELD = 8;
+
+    auto pe_header = *reinterpret_cast<const uint32_t*>(base + PE_HEADER_OFFSET_FIELD);
+    return *reinterpret_cast<const uint32_t*>(base + pe_header + TIMESTAMP_FIELD);
+}
+
+std::pair<size_t, uint32_t> exe_fingerprint() {
+    auto [base, size] = get_exe_range();
+    return {size, exe_timestamp(base)};
+}
+
+// Written by python once a scan finds the function. Holds, in hex, the version, the exe's size and
+// timestamp, and the offset.
+constexpr uint32_t SIGSCAN_CACHE_VERSION = 1;
+
+// In '.cache' in the mods folder, beside the package this module was loaded from
+std::filesystem::path sigscan_cache_file() {
+    HMODULE this_module = nullptr;
+    if (GetModuleHandleExW(
+            GET_MODULE_HANDLE_EX_FLAG_FROM_ADDRESS | GET_MODULE_HANDLE_EX_FLAG_UNCHANGED_REFCOUNT,
+            reinterpret_cast<LPCWSTR>(&sigscan_cache_file),
+            &this_module
+        )
+        == 0) {
+        return {};
+    }
+
+    std::array<wchar_t, MAX_PATH> module_path{};
+    auto len = GetModuleFileNameW(this_module, module_path.data(), module_path.size());
+    if (len == 0 || len == module_path.size()) {
+        return {};
+    }
+    return std::filesystem::path{std::wstring_view{module_path.data(), len}}
+               .parent_path()
+               .parent_path()
+           / ".cache" / "keybinds_sigscan.txt";
+}
+
+// The offset cached for this build of the game, if there is one
+std::optional<uintptr_t> read_cached_offset() {
+    const std::filesystem::path path = sigscan_cache_file();
+    if (path.empty()) {
+        return std::nullopt;
+    }
+
+    std::ifstream file{path};
+    uint32_t version{};
+    size_t exe_size{};
+    uint32_t timestamp{};
+    uintptr_t offset{};
+    if (!(file >> std::hex >> version >> exe_size >> timestamp >> offset)) {
+        return std::nullopt;
+    }
+
+    if (version != SIGSCAN_CACHE_VERSION || std::pair{exe_size, timestamp} != exe_fingerprint()) {
+        return std::nullopt;
+    }
+    return offset;
+}
+
+// How the input hook was installed, for python to log and cache
+struct InputHookInfo {
+    std::optional<uintptr_t> offset;  // From the start of the exe, empty if it wasn't found
+    bool had_cache{};                 // If there was a cached offset for this build of the game
+    bool cache_hit{};                 // If the signature still matched at that offset
+    double seconds{};                 // How long finding the function took
+};
+InputHookInfo input_hook_info{};
+
+// Hooks the input function, only scanning for it if the offset cached by a previous launch no
+// longer matches the signature. Run when the module is loaded.
+void install_input_hook() {
+    auto [base, size] = get_exe_range();
+    auto start = Clock::now();
+
+    uintptr_t addr = 0;
+    const std::optional<uintptr_t> cached = read_cached_offset();
+    if (cached.has_value() && *cached < size - INPUT_FUN_SIG_SIZE) {
+        // A window just past the signature's size only leaves room for it to match at the start
+        addr = INPUT_FUN_SIG.sigscan_nullable(base + *cached, INPUT_FUN_SIG_SIZE + 1);
+        if (addr != base + *cached) {
+            addr = 0;
+        }
+    }
+    input_hook_info.had_cache = cached.has_value();
+    input_hook_info.cache_hit = addr != 0;
+
+    if (addr == 0) {
+        const py::gil_scoped_release gil{};
+        addr = INPUT_FUN_SIG.sigscan_nullable();
+    }
+    input_hook_info.seconds = std::chrono::duration<double>(Clock::now() - start).count();
+
+    // Python logs the failure, keybinds just never see any input
+    if (addr == 0) {
+        return;
+    }
+    input_hook_info.offset = addr - base;
+    detour(addr, hook_input_func, &input_func_ptr, "__keybinds_hook_input_func");
+}
+
 }  // namespace keybinds
 
 // ############################################################################//
@@ -191,47 +2165,123 @@ PYBIND11_MODULE(keybinds, m) {
     using namespace unrealsdk::memory;
     using namespace keybinds;
 
-    detour(
-        keybinds::INPUT_FUN_SIG,
-        keybinds::hook_input_func,
-        &keybinds::input_func_ptr,
-        "__keybinds_hook_input_func"
-    );
+    keybinds::warm_py_caches();
+    keybinds::install_input_hook();
+
+    m.def("start_recording", &keybinds::start_recording, "path"_a);
+    m.def("stop_recording", &keybinds::stop_recording);
+    m.def("is_recording", []() { return keybinds::recording_active.load(); });
+    m.def("replay_recording", &keybinds::replay_recording, "path"_a, "realtime"_a = false);
+
+    m.def("exe_fingerprint", &keybinds::exe_fingerprint);
+    m.def("sigscan_cache_file", &keybinds::sigscan_cache_file);
+    m.def("input_hook_info", []() {
+        const auto& info = keybinds::input_hook_info;
+        return py::make_tuple(
+            info.offset.has_value() ? py::cast(*info.offset) : py::none(),
+            info.had_cache,
+            info.cache_hit,
+            info.seconds
+        );
+    });
 
     m.def(
         "register_keybind",
-        [](const std::optional<FName>& key,
-           const std::optional<EInputEvent>& filter,
-           bool is_gameplay_bind,
-           const py::object& callback) -> void* {
-        using keybinds::KeybindInfo;
-        auto it = keybinds::callback_map.emplace(
-            std::make_pair(
-                key.value_or(ANY_KEY),
-                std::make_shared<KeybindInfo>(callback, filter, is_gameplay_bind, !key.has_value())
-            )
-        );
-        return it->second.get();
-    },
+        &keybinds::register_keybind,
         "key"_a,
         "filter"_a,
         "is_gameplay_bind"_a,
+        "callback"_a,
+        py::kw_only{},
+        "frame"_a = py::none(),
+        "events"_a = py::none(),
+        "deferred"_a = false
+    );
+
+    m.def(
+        "register_axis",
+        &keybinds::register_axis,
+        "key"_a,
+        "is_gameplay_bind"_a,
+        "callback"_a,
+        py::kw_only{},
+        "dead_zone"_a = 0.0F,
+        "threshold"_a = 0.0F,
+        "coalesce"_a = false
+    );
+
+    m.def(
+        "register_chord",
+        &keybinds::register_chord,
+        "modifiers"_a,
+        "key"_a,
+        "is_gameplay_bind"_a,
+        "callback"_a,
+        py::kw_only{},
+        "filter"_a = IE_Pressed
+    );
+    m.def(
+        "register_sequence",
+        &keybinds::register_sequence,
+        "keys"_a,
+        "timeout"_a,
+        "is_gameplay_bind"_a,
         "callback"_a
     );
 
-    m.def("deregister_keybind", [](void* handle) {
-        std::erase_if(keybinds::callback_map, [handle](const auto& entry) -> bool {
-            const auto& [_, info] = entry;
-            return handle == info.get();
-        });
-    }, "handle"_a);
+    m.def(
+        "add_block_rule",
+        &keybinds::add_block_rule,
+        "key"_a,
+        "events"_a = py::none(),
+        "is_gameplay_bind"_a = py::none(),
+        py::kw_only{},
+        "enabled"_a = true
+    );
+    m.def(
+        "set_block_rule_enabled", &keybinds::set_block_rule_enabled, "handle"_a, "enabled"_a
+    );
 
-    m.def("deregister_by_key", [](const FName& key) {
-        std::erase_if(keybinds::callback_map, [key](const auto& entry) {
-            const auto& [key_in_map, _] = entry;
-            return key == key_in_map;
-        });
-    }, "key"_a);
+    m.def("event_mask", [](const py::args& events) {
+        EventMask mask = 0;
+        for (const py::handle event : events) {
+            mask |= keybinds::validate_event(py::cast<EInputEvent>(event));
+        }
+        return mask;
+    });
 
-    m.def("deregister_all", []() { keybinds::callback_map.clear(); });
-}
\ No newline at end of file
+    m.def("deregister_keybind", &keybinds::deregister_keybind, "handle"_a);
+    m.def("deregister_many", &keybinds::deregister_many, "handles"_a);
+    m.def("deregister_by_key", &keybinds::deregister_by_key, "key"_a);
+    m.def("deregister_all", &keybinds::deregister_all);
+
+    m.def("push_frame", &keybinds::push_frame);
+    m.def("pop_frame", &keybinds::pop_frame);
+
+    m.def("is_key_down", &keybinds::is_key_down, "key"_a, "is_gameplay"_a = py::none());
+    m.def("key_held_time", &keybinds::key_held_time, "key"_a, "is_gameplay"_a = py::none());
+    m.def("keys_down", &keybinds::keys_down, "is_gameplay"_a = py::none());
+
+    m.def("set_profiling", &keybinds::set_profiling, "enabled"_a);
+    m.def("is_profiling", []() { return keybinds::profiling_enabled; });
+    m.def("get_callback_stats", &keybinds::get_callback_stats);
+    m.def("get_frame_stats", &keybinds::get_frame_stats);
+    m.def("reset_stats", &keybinds::reset_stats);
+
+    m.def("dispatch_table_info", []() {
+        const keybinds::RegistryLock lock{};
+        return py::make_tuple(
+            keybinds::dispatch_table_version,
+            keybinds::snapshots.size(),
+            keybinds::dispatch_table_stale.load()
+        );
+    });
+
+    m.def("key_name_cache_info", []() {
+        return py::make_tuple(
+            keybinds::key_name_cache.size(),
+            keybinds::key_name_cache_hits,
+            keybinds::key_name_cache_misses
+        );
+    });
+}
@@ -1,20 +1,65 @@
-from collections.abc import Callable
-from typing import NewType, overload
+from collections.abc import Callable, Iterable, Sequence, Set
+from os import PathLike
+from pathlib import Path
+from typing import Any, NewType, TypedDict, overload
 
 from unrealsdk.hooks import Block
 from mods_base import EInputEvent
 
 __all__: tuple[str, ...] = (
     "register_keybind",
+    "event_mask",
+    "register_axis",
+    "register_chord",
+    "register_sequence",
+    "add_block_rule",
+    "set_block_rule_enabled",
     "deregister_keybind",
+    "deregister_many",
     "deregister_by_key",
     "deregister_all",
+    "push_frame",
+    "pop_frame",
+    "is_key_down",
+    "key_held_time",
+    "keys_down",
+    "set_profiling",
+    "is_profiling",
+    "get_callback_stats",
+    "get_frame_stats",
+    "reset_stats",
+    "key_name_cache_info",
+    "dispatch_table_info",
+    "start_recording",
+    "stop_recording",
+    "is_recording",
+    "replay_recording",
+    "exe_fingerprint",
+    "sigscan_cache_file",
+    "input_hook_info",
 )
 
 _KeybindHandle = NewType("_KeybindHandle", object)
+_KeybindFrame = NewType("_KeybindFrame", int)
 type _BlockSignal = None | Block | type[Block]
 
 
+class _CallbackStats(TypedDict):
+    kind: str
+    callback: Callable[..., Any]
+    calls: int
+    total: float
+    max: float
+    histogram: list[int]
+
+
+class _FrameStats(TypedDict):
+    frames: int
+    total: float
+    max: float
+    last: float
+
+
 ################################################################################
 # | REGISTER KEYBINDS |
 ################################################################################
@@ -24,35 +69,233 @@ def register_keybind(
         key: str,
         filter: None,
         is_gameplay_bind: bool,
-        callback: Callable[[EInputEvent], _BlockSignal]
+        callback: Callable[[EInputEvent], _BlockSignal],
+        *,
+        frame: _KeybindFrame | None = None,
+        events: int | None = None,
+        deferred: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
         key: str,
         filter: EInputEvent,
         is_gameplay_bind: bool,
-        callback: Callable[[], _BlockSignal]
+        callback: Callable[[], _BlockSignal],
+        *,
+        frame: _KeybindFrame | None = None,
+        events: None = None,
+        deferred: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
-        key: None,
+        key: Set[str] | None,
         filter: EInputEvent,
         is_gameplay_bind: bool,
-        callback: Callable[[str], _BlockSignal]
+        callback: Callable[[str], _BlockSignal],
+        *,
+        frame: _KeybindFrame | None = None,
+        events: None = None,
+        deferred: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
-        key: None,
+        key: Set[str] | None,
         filter: None,
         is_gameplay_bind: bool,
-        callback: Callable[[EInputEvent, str], _BlockSignal]
+        callback: Callable[[EInputEvent, str], _BlockSignal],
+        *,
+        frame: _KeybindFrame | None = None,
+        events: int | None = None,
+        deferred: bool = False,
 ) -> _KeybindHandle: ...
 def register_keybind(
-        key: str | None,
+        key: str | Set[str] | None,
         filter: EInputEvent | None,
         is_gameplay_bind: bool,
-        callback: Callable[[...], _BlockSignal]
+        callback: Callable[[...], _BlockSignal],
+        *,
+        frame: _KeybindFrame | None = None,
+        events: int | None = None,
+        deferred: bool = False,
+) -> _KeybindHandle:
+    """
+    Registers a keybind callback.
+
+    Deferred keybinds are for callbacks which never need to block input. Their events are queued
+    without touching python, then delivered in order, in one batch per frame, on the next tick.
+    Their return value is ignored. Keybinds which aren't deferred are called synchronously from the
+    input hook, and may block the rest of the chain.
+
+    Args:
+        key: The key to bind, a set of keys, or None for any key.
+        filter: The only event to call the callback for, or None to be passed every event.
+        is_gameplay_bind: True to only handle gameplay input, False to only handle UI input.
+        callback: The callback to run.
+        frame: The raw keybind frame the keybind belongs to.
+        events: A mask of the events to call the callback for, see `event_mask`.
+        deferred: True to deliver events once per frame rather than as they happen.
+    Returns:
+        A handle which can be used to deregister the keybind.
+    """
+    ...
+
+
+def event_mask(*events: EInputEvent) -> int: ...
+
+
+################################################################################
+# | REGISTER AXES |
+################################################################################
+
+@overload
+def register_axis(
+        key: str,
+        is_gameplay_bind: bool,
+        callback: Callable[[float], None],
+        *,
+        dead_zone: float = 0.0,
+        threshold: float = 0.0,
+        coalesce: bool = False,
+) -> _KeybindHandle: ...
+@overload
+def register_axis(
+        key: Set[str] | None,
+        is_gameplay_bind: bool,
+        callback: Callable[[float, str], None],
+        *,
+        dead_zone: float = 0.0,
+        threshold: float = 0.0,
+        coalesce: bool = False,
+) -> _KeybindHandle: ...
+def register_axis(
+        key: str | Set[str] | None,
+        is_gameplay_bind: bool,
+        callback: Callable[..., None],
+        *,
+        dead_zone: float = 0.0,
+        threshold: float = 0.0,
+        coalesce: bool = False,
+) -> _KeybindHandle:
+    """
+    Registers a callback for an analog axis, such as a stick or the mouse.
+
+    Values inside the dead zone are treated as zero. Without a threshold, every value is delivered
+    except a repeated zero, so that delta axes such as the mouse see steady movement. With one, the
+    callback is only run when the value changes by at least that much, or returns to zero.
+
+    Args:
+        key: The axis key, a set of them, or None for every axis.
+        is_gameplay_bind: True to only run during gameplay, False to only run outside of it.
+        callback: The callback to run with the new value, and the key if it may be one of many.
+        dead_zone: Values with a magnitude below this are delivered as zero.
+        threshold: The minimum change from the last delivered value.
+        coalesce: If true, delivers at most one value per key per frame.
+    Returns:
+        A handle which can be passed to deregister_keybind.
+    """
+
+
+################################################################################
+# | CHORDS AND SEQUENCES |
+################################################################################
+
+@overload
+def register_chord(
+        modifiers: Iterable[str],
+        key: str,
+        is_gameplay_bind: bool,
+        callback: Callable[[], _BlockSignal],
+        *,
+        filter: EInputEvent = EInputEvent.IE_Pressed,
+) -> _KeybindHandle: ...
+@overload
+def register_chord(
+        modifiers: Iterable[str],
+        key: str,
+        is_gameplay_bind: bool,
+        callback: Callable[[EInputEvent], _BlockSignal],
+        *,
+        filter: None,
 ) -> _KeybindHandle: ...
+def register_chord(
+        modifiers: Iterable[str],
+        key: str,
+        is_gameplay_bind: bool,
+        callback: Callable[..., _BlockSignal],
+        *,
+        filter: EInputEvent | None = EInputEvent.IE_Pressed,
+) -> _KeybindHandle:
+    """
+    Registers a callback for a key pressed while some modifiers are held, e.g. Ctrl+F5.
+
+    'Ctrl', 'Shift' and 'Alt' match either side, and must not be held unless they're part of the
+    chord. Any other modifier is a key name, which only needs to be held.
+
+    Chords run before regular keybinds. Returning Block skips the rest of the chords, sequences and
+    keybinds for the event, but the game still sees it.
+
+    Args:
+        modifiers: The modifiers which must be held.
+        key: The key which triggers the chord.
+        is_gameplay_bind: True to only run during gameplay, False to only run outside of it.
+        callback: The callback to run, passed the event if there is no filter.
+        filter: The event to trigger on, or None for every event.
+    Returns:
+        A handle which can be passed to deregister_keybind.
+    """
+
+
+def register_sequence(
+        keys: Sequence[str],
+        timeout: float,
+        is_gameplay_bind: bool,
+        callback: Callable[[], _BlockSignal],
+) -> _KeybindHandle:
+    """
+    Registers a callback for a sequence of key presses, e.g. G, G within 0.3 seconds.
+
+    A wrong press keeps whatever recent presses can still begin the sequence, so A, A, A, B
+    completes A, A, B. Sequences run after chords and before regular keybinds.
+    Returning Block skips the remaining callbacks for the final press, but the game still sees it.
+
+    Args:
+        keys: The keys to press, in order.
+        timeout: The seconds between the first and last press.
+        is_gameplay_bind: True to only run during gameplay, False to only run outside of it.
+        callback: The callback to run once the sequence is complete.
+    Returns:
+        A handle which can be passed to deregister_keybind.
+    """
+
+
+################################################################################
+# | BLOCK RULES |
+################################################################################
+
+def add_block_rule(
+        key: str | Set[str] | None,
+        events: int | None = None,
+        is_gameplay_bind: bool | None = None,
+        *,
+        enabled: bool = True,
+) -> _KeybindHandle:
+    """
+    Stops the game from seeing matching input, without running any python.
+
+    Keybinds are still run for blocked input.
+
+    Args:
+        key: The key to block, a set of them, or None for every key.
+        events: A mask of the events to block, from event_mask; None for every event.
+        is_gameplay_bind: True to only block during gameplay, False to only block outside of it,
+                          None to block in both.
+        enabled: Whether the rule starts enabled.
+    Returns:
+        A handle which can be passed to set_block_rule_enabled or deregister_keybind.
+    """
+
+
+def set_block_rule_enabled(handle: _KeybindHandle, enabled: bool) -> None: ...
 
 
 ################################################################################
@@ -62,7 +305,214 @@ def register_keybind(
 def deregister_keybind(handle: _KeybindHandle) -> None: ...
 
 
+def deregister_many(handles: Sequence[_KeybindHandle]) -> None: ...
+
+
 def deregister_by_key(key: str) -> None: ...
 
 
 def deregister_all() -> None: ...
+
+
+################################################################################
+# | FRAMES |
+################################################################################
+
+def push_frame() -> _KeybindFrame: ...
+
+
+def pop_frame() -> None: ...
+
+
+################################################################################
+# | KEY STATE |
+################################################################################
+
+def is_key_down(key: str, is_gameplay: bool | None = None) -> bool:
+    """
+    Checks if a key is currently held.
+
+    Args:
+        key: The key to check.
+        is_gameplay: If given, only checks for presses in gameplay, or outside of it.
+    Returns:
+        True if the key is held.
+    """
+    ...
+
+
+def key_held_time(key: str, is_gameplay: bool | None = None) -> float | None:
+    """
+    Gets how long a key has been held.
+
+    Args:
+        key: The key to check.
+        is_gameplay: If given, only checks for presses in gameplay, or outside of it.
+    Returns:
+        The seconds since the key was pressed, or None if it isn't held.
+    """
+    ...
+
+
+def keys_down(is_gameplay: bool | None = None) -> list[str]:
+    """
+    Gets every key which is currently held.
+
+    Args:
+        is_gameplay: If given, only includes keys pressed in gameplay, or outside of it.
+    Returns:
+        The held keys, in no particular order.
+    """
+    ...
+
+
+################################################################################
+# | STATS |
+################################################################################
+
+def set_profiling(enabled: bool) -> None: ...
+
+
+def is_profiling() -> bool: ...
+
+
+def get_callback_stats() -> list[_CallbackStats]:
+    """
+    Gets a snapshot of the stats of every callback which has run while profiling.
+
+    Times are in seconds. The histogram has 16 buckets of powers of two microseconds, [0, 1),
+    [1, 2), [2, 4) and so on, with the last being open ended.
+
+    Returns:
+        The stats of each callback, in registration order.
+    """
+    ...
+
+
+def get_frame_stats() -> _FrameStats:
+    """
+    Gets a snapshot of how long the input hook held the GIL in each frame while profiling.
+
+    Returns:
+        The number of frames, and the total, max and last GIL time in seconds.
+    """
+    ...
+
+
+def reset_stats() -> None: ...
+
+
+################################################################################
+# | CACHES |
+################################################################################
+
+def key_name_cache_info() -> tuple[int, int, int]:
+    """
+    Gets the state of the cache of python strings for key names.
+
+    Returns:
+        A tuple of the number of cached names, cache hits, and cache misses.
+    """
+    ...
+
+
+def dispatch_table_info() -> tuple[int, int, bool]:
+    """
+    Gets the state of the snapshots of the registered binds which the input hook reads.
+
+    (De)registrations only mark the latest snapshot stale. A new one is built once, before the next
+    input event or tick, however many changes were made. Older ones are kept until no input could
+    still be using them.
+
+    Returns:
+        A tuple of the latest snapshot's version, the number of snapshots still alive, and if the
+        latest is stale.
+    """
+    ...
+
+
+################################################################################
+# | RECORD AND REPLAY |
+################################################################################
+
+def start_recording(path: str | PathLike[str]) -> None:
+    """
+    Starts recording every input event the hook receives, along with frame boundaries.
+
+    Events are buffered in memory, the file is only written by `stop_recording`. Buffering stops
+    after about four million events, or 65535 distinct keys, in which case a warning is logged when
+    the recording is stopped.
+
+    Args:
+        path: The file to write the recording to.
+    """
+    ...
+
+
+def stop_recording() -> int:
+    """
+    Stops recording and writes the recording to disk.
+
+    Returns:
+        The number of events recorded, including frame boundaries.
+    """
+    ...
+
+
+def is_recording() -> bool: ...
+
+
+def replay_recording(path: str | PathLike[str], realtime: bool = False) -> tuple[int, float]:
+    """
+    Runs a recording through keybind dispatch, as if it were live input.
+
+    The game never sees replayed input, but key state, block rules and every kind of bind do.
+    Recorded frame boundaries flush coalesced axes and end the profiled frame. Once it finishes, the
+    held keys, sequence progress, axis values and queued events are put back how they were before.
+
+    Must be called from the game thread. A realtime replay blocks the game until it's finished.
+
+    Args:
+        path: The recording to replay.
+        realtime: If true, keeps the recorded timing between events, rather than replaying as fast
+                  as possible.
+    Returns:
+        A tuple of the number of input events dispatched, and how long the replay took in seconds.
+    """
+    ...
+
+
+################################################################################
+# | INPUT HOOK |
+################################################################################
+
+def exe_fingerprint() -> tuple[int, int]:
+    """
+    Gets what identifies the running build of the game.
+
+    Returns:
+        A tuple of the exe's size and its PE header link timestamp.
+    """
+    ...
+
+
+def sigscan_cache_file() -> Path:
+    """
+    Gets where the offset of the input function is cached between launches.
+
+    Returns:
+        The path of the cache file, which may not exist yet.
+    """
+    ...
+
+
+def input_hook_info() -> tuple[int | None, bool, bool, float]:
+    """
+    Gets how the input hook was installed, which happens as soon as this module is loaded.
+
+    Returns:
+        A tuple of the offset of the input function from the exe base (None if it wasn't found),
+        whether there was a cached offset for this build of the game, whether the signature still
+        matched at it, and how long finding the function took in seconds.
+    """
+    ...
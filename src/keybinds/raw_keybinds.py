@@ -11,10 +11,13 @@ from typing import TYPE_CHECKING, cast, overload
 
 from mods_base.keybinds import EInputEvent, KeybindBlockSignal
 
-from .keybinds import deregister_keybind, register_keybind
+from .keybinds import deregister_keybind, pop_frame, push_frame, register_keybind
 
 if TYPE_CHECKING:
-    from .keybinds import _KeybindHandle  # pyright: ignore[reportPrivateUsage]
+    from .keybinds import (  # pyright: ignore[reportPrivateUsage]
+        _KeybindFrame,
+        _KeybindHandle,
+    )
 
 __all__: tuple[str, ...] = (
     "add",
@@ -30,6 +33,9 @@ Raw keybinds work off of a stack. The top of the stack represents the currently
 callbacks within it are processed. On opening a new menu, with different focus, you should push a
 new frame, and register callbacks within it. On closing a menu, you should pop it's frame.
 
+The stack itself lives in the native module. Pushing a frame only suspends the one below it, and
+popping resumes it, so the keybinds in lower frames are never re-registered.
+
 Raw keybinds follow the standard blocking logic when multiple callbacks receive the same event. Raw
 keybinds are processed *before* gameplay keybinds, so a raw keybind specifying to block the input
 will prevent any matching gameplay keybinds from being run.
@@ -61,6 +67,7 @@ class RawKeybind:
     callback: RawKeybindCallback_Any
 
     _handle: _KeybindHandle | None = None
+    _frame: _KeybindFrame | None = None
 
     def enable(self) -> None:
         """Enables this keybind."""
@@ -75,6 +82,7 @@ class RawKeybind:
                     self.key,
                     False,
                     cast(RawKeybindCallback_KeyAndEvent, self.callback),
+                    frame=self._frame,
                 )
             else:
                 self._handle = register_keybind(
@@ -82,6 +90,7 @@ class RawKeybind:
                     self.event,
                     False,
                     cast(RawKeybindCallback_KeyOnly, self.callback),
+                    frame=self._frame,
                 )
         elif self.event is None:
             self._handle = register_keybind(
@@ -89,6 +98,7 @@ class RawKeybind:
                 self.event,
                 False,
                 cast(RawKeybindCallback_EventOnly, self.callback),
+                frame=self._frame,
             )
         else:
             self._handle = register_keybind(
@@ -96,6 +106,7 @@ class RawKeybind:
                 self.event,
                 False,
                 cast(RawKeybindCallback_NoArgs, self.callback),
+                frame=self._frame,
             )
 
     def disable(self) -> None:
@@ -108,28 +119,24 @@ class RawKeybind:
 
 
 raw_keybind_callback_stack: list[list[RawKeybind]] = []
+_native_frame_stack: list[_KeybindFrame] = []
 
 
 def push() -> None:
     """Pushes a new raw keybind frame."""
-    if raw_keybind_callback_stack:
-        old_frame = raw_keybind_callback_stack[-1]
-        for bind in old_frame:
-            bind.disable()
-
+    _native_frame_stack.append(push_frame())
     raw_keybind_callback_stack.append([])
 
 
 def pop() -> None:
     """Pops the current raw keybind frame."""
     old_frame = raw_keybind_callback_stack.pop()
-    for bind in old_frame:
-        bind.disable()
+    _native_frame_stack.pop()
+    pop_frame()
 
-    if raw_keybind_callback_stack:
-        new_frame = raw_keybind_callback_stack[-1]
-        for bind in new_frame:
-            bind.enable()
+    # The native frame took its keybinds with it
+    for bind in old_frame:
+        bind._handle = None
 
 
 @overload
@@ -213,7 +220,7 @@ def add(
     """
 
     def decorator(callback: RawKeybindCallback_Any) -> None:
-        bind = RawKeybind(key, event, callback)
+        bind = RawKeybind(key, event, callback, _frame=_native_frame_stack[-1])
         raw_keybind_callback_stack[-1].append(bind)
         bind.enable()
 
@@ -0,0 +1,37 @@
+"""
+Benchmarks keybind dispatch by replaying input recordings made by the native `start_recording`.
+
+See `recording_format` to read or replay a recording without the game.
+"""
+
+from os import PathLike
+
+from unrealsdk import logging
+
+from .keybinds import replay_recording, reset_stats, set_profiling
+from .stats import dump_stats
+
+__all__: tuple[str, ...] = ("benchmark",)
+
+
+def benchmark(path: str | PathLike[str], realtime: bool = False, limit: int | None = 20) -> None:
+    """
+    Replays a recording with profiling enabled, then logs its throughput and the callback stats.
+
+    Args:
+        path: The recording to replay.
+        realtime: If true, keeps the recorded timing between events.
+        limit: The most callbacks to list, or None to list all of them.
+    """
+    reset_stats()
+    set_profiling(True)
+    try:
+        events, elapsed = replay_recording(path, realtime)
+    finally:
+        set_profiling(False)
+
+    rate = events / elapsed if elapsed > 0 else float("inf")
+    logging.info(
+        f"Replayed {events} input events in {elapsed * 1000:.1f}ms ({rate:,.0f} events/s)"
+    )
+    dump_stats(limit)
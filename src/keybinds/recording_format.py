@@ -0,0 +1,154 @@
+"""
+Reads input recordings made by the native `start_recording`.
+
+A recording is little endian:
+    4s   magic, 'KBRC'
+    H    format version, 2; version 1 is identical but with B key name lengths
+    H    number of key names, each a H length followed by that many utf-8 bytes
+    Q    number of events, each a fixed size record of:
+        Q    nanoseconds since the recording started
+        f    the axis amount
+        H    index into the key names
+        B    the EInputEvent, or 0xFF to mark the end of a frame
+        B    flags, 1 if the event came from a gamepad, 2 if it was gameplay input
+
+This only uses the standard library, so it works outside of the game by loading this file on its
+own. `replay_recording` stands in for the native replay there, timing a recording through whatever
+dispatch function it's given.
+"""
+
+import struct
+import time
+from collections.abc import Callable, Iterator
+from os import PathLike
+from pathlib import Path
+from typing import NamedTuple
+
+__all__: tuple[str, ...] = (
+    "RecordedEvent",
+    "read_recording",
+    "replay_recording",
+)
+
+_MAGIC: bytes = b"KBRC"
+_VERSION: int = 2
+_VERSION_SHORT_NAMES: int = 1
+
+_HEADER = struct.Struct("<4sH")
+_KEY_COUNT = struct.Struct("<H")
+_KEY_LENGTH = struct.Struct("<H")
+_SHORT_KEY_LENGTH = struct.Struct("<B")
+_EVENT_COUNT = struct.Struct("<Q")
+_EVENT = struct.Struct("<QfHBB")
+
+_TICK: int = 0xFF
+_GAMEPAD: int = 1 << 0
+_GAMEPLAY: int = 1 << 1
+
+
+class RecordedEvent(NamedTuple):
+    """
+    A single recorded input event.
+
+    Attributes:
+        timestamp: Seconds since the recording started.
+        key: The key's name, or None if this marks the end of a frame.
+        event: The EInputEvent, or None if this marks the end of a frame.
+        amount: The axis amount.
+        is_gamepad: True if the event came from a gamepad.
+        is_gameplay: True if the event was gameplay input, False if it was UI input.
+    """
+
+    timestamp: float
+    key: str | None
+    event: int | None
+    amount: float
+    is_gamepad: bool
+    is_gameplay: bool
+
+
+def _read(data: memoryview, offset: int, fmt: struct.Struct) -> tuple[tuple, int]:
+    return fmt.unpack_from(data, offset), offset + fmt.size
+
+
+def read_recording(path: str | PathLike[str]) -> Iterator[RecordedEvent]:
+    """
+    Reads the events from a recording.
+
+    Args:
+        path: The recording to read.
+    Returns:
+        An iterator over the recorded events, in order, including frame boundaries.
+    """
+    data = memoryview(Path(path).read_bytes())
+
+    (magic, version), offset = _read(data, 0, _HEADER)
+    if magic != _MAGIC or version not in (_VERSION, _VERSION_SHORT_NAMES):
+        raise ValueError(f"'{path}' is not a supported keybind recording")
+    key_length = _KEY_LENGTH if version == _VERSION else _SHORT_KEY_LENGTH
+
+    (key_count,), offset = _read(data, offset, _KEY_COUNT)
+    keys: list[str] = []
+    for _ in range(key_count):
+        (length,), offset = _read(data, offset, key_length)
+        keys.append(bytes(data[offset : offset + length]).decode("utf-8"))
+        offset += length
+
+    (event_count,), offset = _read(data, offset, _EVENT_COUNT)
+    if len(data) - offset < event_count * _EVENT.size:
+        raise ValueError(f"'{path}' is truncated")
+
+    for timestamp, amount, key, event, flags in _EVENT.iter_unpack(
+        data[offset : offset + event_count * _EVENT.size],
+    ):
+        is_tick = event == _TICK
+        yield RecordedEvent(
+            timestamp / 1e9,
+            None if is_tick else keys[key],
+            None if is_tick else event,
+            amount,
+            (flags & _GAMEPAD) != 0,
+            (flags & _GAMEPLAY) != 0,
+        )
+
+
+def replay_recording(
+    path: str | PathLike[str],
+    dispatch: Callable[[str, int, float, bool], object],
+    tick: Callable[[], object] | None = None,
+    realtime: bool = False,
+) -> tuple[int, float]:
+    """
+    Feeds a recording to a stand in for keybind dispatch, for benchmarking without the game.
+
+    The recording is read up front, so only dispatch is timed.
+
+    Args:
+        path: The recording to replay.
+        dispatch: Called with the key, input event, axis amount and if it was gameplay input, for
+                  each recorded input event.
+        tick: If not None, called at each recorded frame boundary.
+        realtime: If true, keeps the recorded timing between events, rather than replaying as fast
+                  as possible.
+    Returns:
+        A tuple of the number of input events dispatched, and how long the replay took in seconds.
+    """
+    events = list(read_recording(path))
+
+    count = 0
+    start = time.perf_counter()
+    for recorded in events:
+        if realtime:
+            delay = recorded.timestamp - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        if recorded.key is None or recorded.event is None:
+            if tick is not None:
+                tick()
+            continue
+
+        dispatch(recorded.key, recorded.event, recorded.amount, recorded.is_gameplay)
+        count += 1
+
+    return count, time.perf_counter() - start
@@ -0,0 +1,50 @@
+import os
+
+from unrealsdk import logging
+
+from .keybinds import exe_fingerprint, input_hook_info, sigscan_cache_file
+
+__all__: tuple[str, ...] = ("log_input_hook",)
+
+"""
+Remembers where the input function was found so later launches can skip the signature scan.
+
+The native module reads the cache and installs the input hook as soon as it's loaded. The offset is
+keyed by the exe's size and link timestamp, and is checked against the signature before being used,
+so a patched game or a stale cache only ever costs the scan it would have done anyway. This module
+only logs what happened, and writes the cache after a scan.
+"""
+
+# Must match what the native module reads
+_CACHE_VERSION: int = 1
+
+
+def _save_offset(offset: int) -> None:
+    cache_file = sigscan_cache_file()
+    size, timestamp = exe_fingerprint()
+
+    tmp_file = cache_file.with_suffix(".tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_file.open("w", encoding="utf-8") as file:
+            file.write(f"{_CACHE_VERSION:x} {size:x} {timestamp:x} {offset:x}\n")
+        os.replace(tmp_file, cache_file)
+    except OSError as ex:
+        logging.warning(f"Failed to write keybind sigscan cache '{cache_file}': {ex}")
+
+
+def log_input_hook() -> None:
+    """Logs how the native input hook was installed, and caches the input function's offset."""
+    offset, had_cache, cache_hit, elapsed = input_hook_info()
+    if offset is None:
+        logging.error("Failed to find the input function; keybinds will not work")
+        return
+
+    if cache_hit:
+        logging.misc(f"Found the input function from cache in {elapsed * 1e6:.0f}us")
+        return
+
+    if had_cache:
+        logging.dev_warning("Cached input function offset no longer matches; rescanned")
+    logging.misc(f"Scanned for the input function in {elapsed * 1000:.1f}ms")
+    _save_offset(offset)
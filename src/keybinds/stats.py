@@ -0,0 +1,91 @@
+from typing import Any
+
+from unrealsdk import logging
+
+from .keybinds import get_callback_stats, get_frame_stats, is_profiling
+
+__all__: tuple[str, ...] = (
+    "callback_name",
+    "dump_stats",
+)
+
+"""
+Console friendly reports of the native keybind stats.
+
+Stats are only collected while profiling is enabled, e.g. from the console:
+    py from keybinds.keybinds import set_profiling; set_profiling(True)
+    py from keybinds.stats import dump_stats; dump_stats()
+"""
+
+# Upper bound, in microseconds, of each latency bucket; the last one is open ended
+_BUCKET_LIMITS: tuple[float, ...] = (1, *(2.0**i for i in range(1, 15)), float("inf"))
+
+
+def callback_name(callback: object) -> str:
+    """
+    Gets a readable name for a callback.
+
+    Args:
+        callback: The callback to name.
+    Returns:
+        The callback's '__module__.__qualname__', or its repr if it has no qualified name.
+    """
+    qualname = getattr(callback, "__qualname__", None)
+    if qualname is None:
+        return repr(callback)
+
+    module = getattr(callback, "__module__", None)
+    return f"{module}.{qualname}" if module else qualname
+
+
+def _percentile(histogram: list[int], fraction: float) -> float:
+    target = sum(histogram) * fraction
+    seen = 0
+    for count, limit in zip(histogram, _BUCKET_LIMITS, strict=True):
+        seen += count
+        if seen >= target:
+            return limit
+    return _BUCKET_LIMITS[-1]
+
+
+def _format_micros(micros: float) -> str:
+    return "inf" if micros == float("inf") else f"{micros:.0f}"
+
+
+def dump_stats(limit: int | None = 20) -> None:
+    """
+    Logs the slowest keybind callbacks, along with how long input held the GIL each frame.
+
+    Args:
+        limit: The most callbacks to list, or None to list all of them.
+    """
+    if not is_profiling():
+        logging.warning("Keybind profiling is disabled; stats may be missing or stale")
+
+    stats: list[dict[str, Any]] = sorted(
+        get_callback_stats(),
+        key=lambda entry: entry["total"],
+        reverse=True,
+    )
+
+    logging.info(
+        f"{'calls':>8} {'total ms':>9} {'mean us':>8} {'max us':>8} {'p99 us':>7}  callback"
+    )
+    for entry in stats[:limit]:
+        mean = entry["total"] / entry["calls"] * 1e6
+        p99 = _percentile(entry["histogram"], 0.99)
+        logging.info(
+            f"{entry['calls']:>8} {entry['total'] * 1000:>9.2f} {mean:>8.0f}"
+            f" {entry['max'] * 1e6:>8.0f} {_format_micros(p99):>7}"
+            f"  [{entry['kind']}] {callback_name(entry['callback'])}"
+        )
+    if limit is not None and len(stats) > limit:
+        logging.info(f"... and {len(stats) - limit} more")
+
+    frames = get_frame_stats()
+    if frames["frames"] > 0:
+        mean = frames["total"] / frames["frames"] * 1e6
+        logging.info(
+            f"GIL held by input per frame: mean {mean:.0f}us, max {frames['max'] * 1e6:.0f}us"
+            f" over {frames['frames']} frames"
+        )
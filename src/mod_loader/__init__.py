@@ -0,0 +1,80 @@
+from mods_base.mod_list import base_mod
+
+from .deferred import DeferredMod, exclude_eager_dependencies, was_enabled_last_session
+from .disabled import DisabledMods, disabled_mods
+from .discovery import (
+    DiscoveryIndex,
+    DiscoveryStats,
+    ModSource,
+    is_valid_mod_archive,
+    is_valid_mod_contents,
+    is_valid_mod_name,
+    is_valid_mod_path,
+    open_mod_source,
+)
+from .hot_reload import HotReloader, find_dependents, track_registrations
+from .manifest import ModManifest, read_manifest
+from .ordering import (
+    order_by_dependencies,
+    scan_optional_imports,
+    scan_submodule_imports,
+    scan_top_level_imports,
+)
+from .parallel import ParallelImporter
+from .precompile import (
+    CentralCacheLoader,
+    PrecompileResult,
+    install_central_cache,
+    precompile_mods,
+)
+from .registry import import_mod, mod_dependencies, mod_sources, mods_by_module
+from .profiling import ImportProfile, ImportProfiler
+
+################################################################################
+# | MODS METADATA |
+################################################################################
+
+__all__: tuple[str, ...] = (
+    "CentralCacheLoader",
+    "DeferredMod",
+    "DisabledMods",
+    "DiscoveryIndex",
+    "DiscoveryStats",
+    "HotReloader",
+    "ImportProfile",
+    "ImportProfiler",
+    "ModManifest",
+    "ModSource",
+    "ParallelImporter",
+    "PrecompileResult",
+    "__author__",
+    "__version__",
+    "__version_info__",
+    "disabled_mods",
+    "exclude_eager_dependencies",
+    "find_dependents",
+    "import_mod",
+    "install_central_cache",
+    "is_valid_mod_archive",
+    "is_valid_mod_contents",
+    "is_valid_mod_name",
+    "is_valid_mod_path",
+    "mod_dependencies",
+    "mod_sources",
+    "mods_by_module",
+    "open_mod_source",
+    "order_by_dependencies",
+    "precompile_mods",
+    "read_manifest",
+    "scan_optional_imports",
+    "scan_submodule_imports",
+    "scan_top_level_imports",
+    "track_registrations",
+    "was_enabled_last_session",
+)
+
+__version_info__: tuple[int, int] = (1, 0)
+__version__: str = f"{__version_info__[0]}.{__version_info__[1]}"
+__author__: str = "-Ry"
+
+base_mod.components.append(base_mod.ComponentInfo("Mod Loader", __version__))
@@ -0,0 +1,166 @@
+import json
+import sys
+import traceback
+
+from collections.abc import Collection, Iterator, Mapping
+from dataclasses import KW_ONLY, dataclass
+from typing import Any
+
+from unrealsdk import logging
+
+from mods_base import SETTINGS_DIR, Mod
+from mods_base.mod_list import deregister_mod, mod_list, register_mod
+
+from .manifest import ModManifest
+from .registry import import_mod, mods_by_module
+
+__all__: tuple[str, ...] = (
+    "DeferredMod",
+    "exclude_eager_dependencies",
+    "was_enabled_last_session",
+)
+
+
+def was_enabled_last_session(module: str) -> bool:
+    """
+    Checks the settings file of a mod to see if it was left enabled, without importing it.
+
+    Args:
+        module: The name of the mod's package.
+    Returns:
+        True if the mod's settings say it was enabled.
+    """
+    try:
+        with (SETTINGS_DIR / f"{module}.json").open("r", encoding="utf-8") as file:
+            settings = json.load(file)
+    except (OSError, ValueError):
+        return False
+    return isinstance(settings, dict) and settings.get("enabled", False) is True
+
+
+def exclude_eager_dependencies(
+    deferrable: Collection[str],
+    eager: Collection[str],
+    dependencies: Mapping[str, Collection[str]],
+) -> set[str]:
+    """
+    Removes every mod an eagerly imported mod depends on, directly or not, from a set of mods.
+
+    Importing the eager mod would import those anyway, leaving their placeholder behind.
+
+    Args:
+        deferrable: The mods which could be deferred.
+        eager: The mods which will be imported at startup.
+        dependencies: The mods each mod depends on.
+    Returns:
+        The mods which can actually be deferred.
+    """
+    deferred = set(deferrable)
+    pending = [mod for mod in eager if mod not in deferred]
+    while pending:
+        for dep in dependencies.get(pending.pop(), ()):
+            if dep in deferred:
+                deferred.remove(dep)
+                pending.append(dep)
+    return deferred
+
+
+@dataclass
+class DeferredMod(Mod):
+    """
+    Stand in for a mod which has not been imported yet.
+
+    The real mod is imported the first time this one is enabled or its options are displayed, at
+    which point the placeholder is replaced in the mod list by whatever the import registered.
+
+    Attributes:
+        manifest: The manifest the placeholder was created from.
+    """
+
+    _: KW_ONLY
+    manifest: ModManifest
+
+    @classmethod
+    def from_manifest(cls, manifest: ModManifest) -> "DeferredMod":
+        return cls(
+            name=manifest.name,
+            author=manifest.author,
+            version=manifest.version,
+            description=manifest.description,
+            settings_file=None,
+            auto_enable=False,
+            manifest=manifest,
+        )
+
+    def _find_registered(self) -> Mod | None:
+        module = self.manifest.module
+        if new_mods := mods_by_module.get(module):
+            return new_mods[0]
+
+        # Imported by another mod, so it wasn't recorded; build_mod names the settings file after
+        # the module
+        settings_file = SETTINGS_DIR / f"{module}.json"
+        return next(
+            (
+                mod
+                for mod in mod_list
+                if not isinstance(mod, DeferredMod)
+                and (mod.settings_file == settings_file or mod.name == self.name)
+            ),
+            None,
+        )
+
+    def _swap(self, real_mod: Mod, index: int) -> None:
+        # Keep the mod where the placeholder was so the menu doesn't jump around
+        mod_list.remove(real_mod)
+        mod_list.insert(min(index, len(mod_list)), real_mod)
+
+    def load(self) -> Mod | None:
+        """
+        Imports the real mod and swaps it in for this placeholder.
+
+        If something else already imported the real mod, the mod it registered is swapped in
+        instead.
+
+        Returns:
+            The mod registered by the import, or None if the import failed.
+        """
+        index = mod_list.index(self) if self in mod_list else len(mod_list)
+        module = self.manifest.module
+
+        if module in sys.modules:
+            real_mod = self._find_registered()
+            if real_mod is None:
+                logging.dev_warning(f"Deferred module '{module}' was imported without a mod")
+                return None
+            deregister_mod(self)
+            self._swap(real_mod, index)
+            return real_mod
+
+        deregister_mod(self)
+        try:
+            new_mods = import_mod(module)
+        except Exception as err:
+            logging.error(f"Failed to load deferred python module: '{module}'")
+            logging.error("".join(traceback.format_exception(err)))
+            register_mod(self)
+            return None
+
+        if not new_mods:
+            return None
+
+        real_mod = new_mods[0]
+        self._swap(real_mod, index)
+        logging.info(f"Loaded deferred mod '{module}'")
+        return real_mod
+
+    def enable(self) -> None:
+        real_mod = self.load()
+        if real_mod is not None and not real_mod.is_enabled:
+            real_mod.enable()
+
+    def iter_display_options(self) -> Iterator[Any]:
+        real_mod = self.load()
+        if real_mod is None:
+            return super().iter_display_options()
+        return real_mod.iter_display_options()
@@ -0,0 +1,126 @@
+import json
+import os
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from unrealsdk import logging
+
+from mods_base import SETTINGS_DIR, BoolOption, NestedOption
+
+__all__: tuple[str, ...] = (
+    "DisabledMods",
+    "disabled_mods",
+)
+
+
+@dataclass
+class DisabledMods:
+    """
+    The set of mods which the loader never imports.
+
+    Mods listed in the '[disabled_mods]' section of 'unrealsdk.toml' are pinned and can only be
+    re-enabled by editing that file. Everything else is toggled at runtime, from the mod menu, and
+    persisted to a settings file. Changes take effect on the next launch since a mod which has
+    already been imported can't be removed from the process.
+
+    Attributes:
+        settings_file: The json file runtime changes are persisted to.
+        pinned: The mods disabled through 'unrealsdk.toml'.
+    """
+
+    settings_file: Path
+    pinned: frozenset[str] = frozenset()
+
+    _disabled: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def load(self) -> None:
+        try:
+            with self.settings_file.open("r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            logging.warning(f"Failed to read disabled mods '{self.settings_file}': {ex}")
+            return
+
+        disabled = data.get("disabled", []) if isinstance(data, dict) else []
+        self._disabled = {x for x in disabled if isinstance(x, str)}
+
+    def save(self) -> None:
+        tmp_file = self.settings_file.with_suffix(".tmp")
+        try:
+            self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_file.open("w", encoding="utf-8") as file:
+                json.dump({"disabled": sorted(self._disabled)}, file, indent=4)
+            os.replace(tmp_file, self.settings_file)
+        except OSError as ex:
+            logging.warning(f"Failed to write disabled mods '{self.settings_file}': {ex}")
+
+    def __contains__(self, module: str) -> bool:
+        return module in self.pinned or module in self._disabled
+
+    def set_disabled(self, module: str, disabled: bool) -> bool:
+        """
+        Adds or removes a mod from the disabled set and persists the change.
+
+        Args:
+            module: The name of the mod's package.
+            disabled: True to stop importing the mod, False to import it again.
+        Returns:
+            False if the mod is pinned by 'unrealsdk.toml' and so can't be re-enabled.
+        """
+        if not disabled and module in self.pinned:
+            logging.warning(f"'{module}' is disabled in unrealsdk.toml; remove it there instead")
+            return False
+
+        if disabled == (module in self._disabled):
+            return True
+
+        if disabled:
+            self._disabled.add(module)
+        else:
+            self._disabled.discard(module)
+        self.save()
+
+        state = "disabled" if disabled else "enabled"
+        logging.info(f"'{module}' will be {state} from the next launch")
+        return True
+
+    def create_option(self, modules: Iterable[str]) -> NestedOption:
+        """
+        Creates a mod menu option with a toggle for every given mod which isn't pinned.
+
+        Args:
+            modules: The names of the mods' packages.
+        Returns:
+            The option; add it to a mod's options to display it.
+        """
+
+        def on_change(option: BoolOption, value: bool) -> None:
+            self.set_disabled(option.identifier, not value)
+
+        children = [
+            BoolOption(
+                module,
+                module not in self,
+                "Load",
+                "Skip",
+                description=(
+                    f"Whether '{module}' is imported when the game starts. Takes effect on the next"
+                    f" launch."
+                ),
+                on_change=on_change,
+            )
+            for module in sorted(modules)
+            if module not in self.pinned
+        ]
+        return NestedOption(
+            "Startup Mods",
+            children,
+            description="Choose which mods are imported; skipped mods cost nothing at startup.",
+        )
+
+
+disabled_mods: DisabledMods = DisabledMods(SETTINGS_DIR / "mod_loader.json")
@@ -0,0 +1,248 @@
+import json
+import os
+import stat
+import zipfile
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+from unrealsdk import logging
+
+__all__: tuple[str, ...] = (
+    "DiscoveryIndex",
+    "DiscoveryStats",
+    "MOD_ARCHIVE_SUFFIXES",
+    "ModSource",
+    "SKIPPED_MOD_NAMES",
+    "is_valid_mod_archive",
+    "is_valid_mod_contents",
+    "is_valid_mod_name",
+    "is_valid_mod_path",
+    "open_mod_source",
+)
+
+# Directories that live next to mods but are never imported as one
+SKIPPED_MOD_NAMES: tuple[str, ...] = (
+    "__pycache__",
+    "mods_base",
+    "mod_loader",
+    "input_base",
+    "keybinds",
+    "pyunrealsdk",
+    "unrealsdk",
+)
+
+# Mods may be installed as a single archive holding '<name>/__init__.py', imported via zipimport
+MOD_ARCHIVE_SUFFIXES: tuple[str, ...] = (".sdkmod", ".zip")
+
+# Where a mod's package lives; either a directory or the package folder inside an archive
+ModSource = Union[Path, zipfile.Path]
+
+# Bump whenever the on-disk layout changes; stale indexes are discarded
+_INDEX_VERSION: int = 1
+
+
+################################################################################
+# | VALIDATION |
+################################################################################
+
+def is_valid_mod_name(name: str) -> bool:
+    return not name.startswith(".") and name not in SKIPPED_MOD_NAMES
+
+
+def is_valid_mod_contents(content: Iterable[str]) -> bool:
+    content = set(content)
+    return ".sdk_skip" not in content and "__init__.py" in content
+
+
+def is_valid_mod_archive(p: Path) -> bool:
+    # Only the central directory is read, none of the members are decompressed
+    name = p.stem
+    if p.suffix.lower() not in MOD_ARCHIVE_SUFFIXES or not is_valid_mod_name(name):
+        return False
+
+    try:
+        with zipfile.ZipFile(p) as archive:
+            members = archive.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+    prefix = f"{name}/"
+    content = (
+        member[len(prefix):].rstrip("/")
+        for member in members
+        if member.startswith(prefix)
+    )
+    return is_valid_mod_contents(x for x in content if x and "/" not in x)
+
+
+def is_valid_mod_path(p: Path) -> bool:
+    if p.is_file():
+        return is_valid_mod_archive(p)
+    if not p.is_dir() or not is_valid_mod_name(p.name):
+        return False
+    return is_valid_mod_contents(x.name for x in p.iterdir())
+
+
+def open_mod_source(p: Path) -> ModSource:
+    """
+    Gets the package location of a valid mod path.
+
+    Args:
+        p: A path which passed `is_valid_mod_path`.
+    Returns:
+        The path itself for directories, or the package folder inside an archive.
+    """
+    if p.suffix.lower() in MOD_ARCHIVE_SUFFIXES and p.is_file():
+        return zipfile.Path(p, at=f"{p.stem}/")
+    return p
+
+
+################################################################################
+# | DISCOVERY INDEX |
+################################################################################
+
+@dataclass
+class DiscoveryStats:
+    """
+    Counters for a single launch of the discovery index.
+
+    Attributes:
+        hits: Children whose directory was unchanged, so the cached verdict was reused.
+        misses: Children which had no cached entry and had to be listed.
+        rescans: Children which had a cached entry but whose directory had changed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    rescans: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.rescans} rescans"
+
+
+def _fingerprint(st: os.stat_result) -> list[int]:
+    return [st.st_mtime_ns, st.st_ino]
+
+
+@dataclass
+class DiscoveryIndex:
+    """
+    On-disk cache of which children of each mod root are valid mods.
+
+    Every directory and mod archive is keyed by its mtime and inode. A root whose fingerprint is
+    unchanged is not listed again, and a child whose fingerprint is unchanged keeps its cached
+    verdict; so a warm launch costs one stat per directory rather than one listing per directory.
+
+    Attributes:
+        cache_file: The json file the index is persisted to.
+        stats: Hit/miss/rescan counters for this launch.
+    """
+
+    cache_file: Path
+    stats: DiscoveryStats = field(default_factory=DiscoveryStats)
+
+    _roots: dict[str, dict] = field(default_factory=dict, init=False, repr=False)
+    _dirty: bool = field(default=False, init=False, repr=False)
+
+    def load(self) -> None:
+        """Loads the index from disk, silently starting empty if it is missing or stale."""
+        try:
+            with self.cache_file.open("r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return
+        self._roots = data.get("roots", {})
+
+    def save(self) -> None:
+        """Writes the index back to disk if anything changed during this launch."""
+        if not self._dirty:
+            return
+
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_file.open("w", encoding="utf-8") as file:
+                json.dump({"version": _INDEX_VERSION, "roots": self._roots}, file)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as ex:
+            logging.warning(f"Failed to write mod discovery index '{self.cache_file}': {ex}")
+
+    def scan(self, root: Path) -> dict[str, bool]:
+        """
+        Gets every child of a mod root along with whether it is a valid mod.
+
+        Args:
+            root: The mod root to scan.
+        Returns:
+            A mapping of child name to validity, in directory listing order.
+        """
+        key = str(root)
+        try:
+            root_fp = _fingerprint(root.stat())
+        except OSError as ex:
+            logging.warning(f"Failed to stat mod directory '{root}': {ex}")
+            return {}
+
+        cached = self._roots.get(key)
+        old_children: dict[str, dict] = {}
+        if cached is not None:
+            old_children = cached["children"]
+
+        # Only list the root when entries may have been added, removed or renamed
+        if cached is not None and cached["fp"] == root_fp:
+            names: Iterable[str] = old_children.keys()
+        else:
+            names = [x.name for x in root.iterdir()]
+            self._dirty = True
+
+        children: dict[str, dict] = {}
+        for name in names:
+            entry = self._scan_child(root / name, old_children.get(name))
+            if entry is not None:
+                children[name] = entry
+
+        if len(children) != len(old_children):
+            self._dirty = True
+
+        self._roots[key] = {"fp": root_fp, "children": children}
+        return {name: entry["valid"] for name, entry in children.items()}
+
+    def _scan_child(self, p: Path, cached: dict | None) -> dict | None:
+        # Names which can never be a mod don't need to be looked at
+        if not is_valid_mod_name(p.name):
+            return {"fp": None, "valid": False}
+
+        try:
+            st = p.stat()
+        except OSError:
+            # Removed since the root was listed
+            return None
+
+        fp = _fingerprint(st)
+        if cached is not None and cached["fp"] == fp:
+            self.stats.hits += 1
+            return cached
+
+        if cached is None:
+            self.stats.misses += 1
+        else:
+            self.stats.rescans += 1
+        self._dirty = True
+
+        valid = False
+        if stat.S_ISDIR(st.st_mode):
+            try:
+                valid = is_valid_mod_contents(os.listdir(p))
+            except OSError as ex:
+                logging.warning(f"Failed to list mod directory '{p}': {ex}")
+        elif stat.S_ISREG(st.st_mode):
+            valid = is_valid_mod_archive(p)
+
+        return {"fp": fp, "valid": valid}
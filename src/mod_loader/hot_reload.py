@@ -0,0 +1,399 @@
+import importlib
+import os
+import sys
+import threading
+import time
+import traceback
+import zipfile
+
+from collections.abc import Callable, Collection, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from unrealsdk import hooks, logging
+
+from mods_base import Mod
+from mods_base.mod_list import deregister_mod
+
+from .discovery import ModSource
+from .ordering import order_by_dependencies
+from .registry import import_mod, mod_dependencies, mod_sources, mods_by_module
+
+__all__: tuple[str, ...] = (
+    "HotReloader",
+    "find_dependents",
+    "track_registrations",
+)
+
+"""
+Development mode which re-imports mods when their files change, without restarting the game.
+
+A background thread waits for changes in the mod directories. On Windows, and so under Wine where
+these are backed by inotify, it uses directory change notifications; elsewhere it polls. Only the
+thread notices changes; the reload itself is run from a tick hook on the game thread.
+
+Mods are reloaded by disabling them, which removes the keybinds and hooks they registered, dropping
+their modules from `sys.modules`, re-importing them, and re-enabling whatever had been enabled.
+
+Hooks and raw keybinds added directly, rather than through a `Mod`, aren't removed by disabling it.
+While `track_registrations` is active these are recorded against the mod whose code the callback
+lives in, removed when it unloads, and added again by its module level code when it's re-imported.
+"""
+
+# Fired every frame, on the game thread, whether or not a level is loaded
+TICK_FUNC: str = "Engine.GameViewportClient:Tick"
+TICK_HOOK_ID: str = "__mod_loader_hot_reload"
+
+_Snapshot = dict[str, int]
+
+
+@dataclass
+class _Registrations:
+    hook_keys: set[tuple[str, hooks.Type, str]] = field(default_factory=set)
+    raw_keybinds: list[Any] = field(default_factory=list)
+
+
+_registrations: dict[str, _Registrations] = {}
+
+
+def _owner(callback: Callable[..., Any]) -> _Registrations | None:
+    module = getattr(callback, "__module__", None)
+    if not isinstance(module, str):
+        return None
+    top_level = module.partition(".")[0]
+    if top_level not in mod_sources:
+        return None
+    return _registrations.setdefault(top_level, _Registrations())
+
+
+def track_registrations() -> None:
+    """
+    Starts recording the hooks and raw keybinds each mod adds directly, so reloads can remove them.
+
+    Must be called before the mods are imported, anything added earlier is missed.
+    """
+    add_hook = hooks.add_hook
+    if getattr(add_hook, "__tracked__", False):
+        return
+
+    def tracked_add_hook(
+        func: str,
+        type: hooks.Type,  # noqa: A002
+        identifier: str,
+        callback: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        add_hook(func, type, identifier, callback, *args, **kwargs)
+        if (owner := _owner(callback)) is not None:
+            owner.hook_keys.add((func, type, identifier))
+
+    tracked_add_hook.__tracked__ = True  # type: ignore[attr-defined]
+    hooks.add_hook = tracked_add_hook
+
+    try:
+        from keybinds.raw_keybinds import RawKeybind
+    except ImportError:
+        return
+
+    enable = RawKeybind.enable
+
+    def tracked_enable(self: RawKeybind) -> None:
+        enable(self)
+        owner = _owner(self.callback)
+        if owner is not None and all(bind is not self for bind in owner.raw_keybinds):
+            owner.raw_keybinds.append(self)
+
+    RawKeybind.enable = tracked_enable  # type: ignore[method-assign]
+
+
+def _remove_registrations(module: str) -> None:
+    registrations = _registrations.pop(module, None)
+    if registrations is None:
+        return
+
+    for func, hook_type, identifier in registrations.hook_keys:
+        hooks.remove_hook(func, hook_type, identifier)
+
+    if registrations.raw_keybinds:
+        from keybinds.raw_keybinds import raw_keybind_callback_stack
+
+        for bind in registrations.raw_keybinds:
+            bind.disable()
+            for frame in raw_keybind_callback_stack:
+                frame[:] = [other for other in frame if other is not bind]
+
+
+def _snapshot(source: ModSource) -> _Snapshot:
+    if isinstance(source, zipfile.Path):
+        archive = str(source.root.filename)
+        try:
+            return {archive: os.stat(archive).st_mtime_ns}
+        except OSError:
+            return {}
+
+    files: _Snapshot = {}
+    for root, dirs, names in os.walk(source):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+        for name in names:
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                try:
+                    files[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+    return files
+
+
+def find_dependents(modules: Collection[str], dependencies: dict[str, set[str]]) -> set[str]:
+    """
+    Finds every module which transitively depends on any of the given ones.
+
+    Args:
+        modules: The modules to start from.
+        dependencies: The direct dependencies of each module.
+    Returns:
+        The given modules plus all of their dependents.
+    """
+    found = set(modules)
+    changed = True
+    while changed:
+        changed = False
+        for module, deps in dependencies.items():
+            if module not in found and not deps.isdisjoint(found):
+                found.add(module)
+                changed = True
+    return found
+
+
+class _ChangeNotifier:
+    # FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_DIR_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE
+    _NOTIFY_FILTER: int = 0x1 | 0x2 | 0x10
+    _WAIT_OBJECT_0: int = 0x0
+    _WAIT_TIMEOUT: int = 0x102
+
+    def __init__(self, roots: Iterable[Path]) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        k32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        k32.FindFirstChangeNotificationW.argtypes = [
+            wintypes.LPCWSTR,
+            wintypes.BOOL,
+            wintypes.DWORD,
+        ]
+        k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        k32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        k32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        k32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.HANDLE),
+            wintypes.BOOL,
+            wintypes.DWORD,
+        ]
+        k32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self._k32 = k32
+
+        handles = []
+        for root in roots:
+            handle = k32.FindFirstChangeNotificationW(str(root), True, self._NOTIFY_FILTER)
+            if handle is None or handle == wintypes.HANDLE(-1).value:
+                logging.warning(f"Failed to watch mod directory '{root}'; it will not hot reload")
+                continue
+            handles.append(handle)
+
+        if not handles:
+            raise OSError("No mod directories could be watched")
+        self._handles = (wintypes.HANDLE * len(handles))(*handles)
+
+    def wait(self, timeout: float) -> bool:
+        result = self._k32.WaitForMultipleObjects(
+            len(self._handles),
+            self._handles,
+            False,
+            int(timeout * 1000),
+        )
+        index = result - self._WAIT_OBJECT_0
+        if 0 <= index < len(self._handles):
+            self._k32.FindNextChangeNotification(self._handles[index])
+            return True
+        return False
+
+    def close(self) -> None:
+        for handle in self._handles:
+            self._k32.FindCloseChangeNotification(handle)
+
+
+class HotReloader:
+    """
+    Watches the loaded mods and reloads the ones whose files changed.
+
+    Attributes:
+        roots: The mod directories to watch.
+        poll_interval: Seconds between checks when change notifications are unavailable.
+        debounce: Seconds to wait after a change so that a burst of saves causes a single reload.
+    """
+
+    def __init__(
+        self,
+        roots: list[Path],
+        poll_interval: float = 1.0,
+        debounce: float = 0.1,
+    ) -> None:
+        self.roots = roots
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+
+        self._snapshots: dict[str, _Snapshot] = {}
+        self._broken: set[str] = set()
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        for module in mods_by_module:
+            self._snapshots[module] = _snapshot(mod_sources[module])
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="mod_hot_reload", daemon=True)
+        self._thread.start()
+        hooks.add_hook(TICK_FUNC, hooks.Type.PRE, TICK_HOOK_ID, self._on_tick)
+        logging.info(f"Hot reload watching {len(self._snapshots)} mods")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        hooks.remove_hook(TICK_FUNC, hooks.Type.PRE, TICK_HOOK_ID)
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _find_changes(self) -> set[str]:
+        changed: set[str] = set()
+
+        # Also watch mods which failed to reload so fixing them brings them back
+        for module in list(mods_by_module.keys() | self._broken):
+            snapshot = _snapshot(mod_sources[module])
+            previous = self._snapshots.get(module)
+            self._snapshots[module] = snapshot
+
+            # Modules loaded since the last check, i.e. deferred mods, start a fresh baseline
+            if previous is not None and previous != snapshot:
+                changed.add(module)
+        return changed
+
+    def _watch(self) -> None:
+        notifier: _ChangeNotifier | None = None
+        try:
+            notifier = _ChangeNotifier(self.roots)
+        except (ImportError, AttributeError, OSError):
+            logging.dev_warning("Directory change notifications unavailable; polling for changes")
+
+        try:
+            while not self._stop.is_set():
+                if notifier is None:
+                    if self._stop.wait(self.poll_interval):
+                        return
+                elif not notifier.wait(self.poll_interval):
+                    continue
+
+                # Let editors finish writing before looking at anything
+                if self._stop.wait(self.debounce):
+                    return
+
+                with self._lock:
+                    self._pending |= self._find_changes()
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+    def _on_tick(self, *_: object) -> None:
+        # Don't stall the frame while the watcher is scanning, just try again next tick
+        if not self._lock.acquire(blocking=False):
+            return
+
+        # Held for the whole reload so the watcher never sees a half reloaded mod list
+        try:
+            if not self._pending:
+                return
+            changed, self._pending = self._pending, set()
+            self.reload(changed)
+        finally:
+            self._lock.release()
+
+    def reload(self, changed: Collection[str]) -> None:
+        """
+        Reloads the given mods along with every loaded mod that depends on them.
+
+        Must be called from the game thread.
+
+        Args:
+            changed: The top level modules which changed.
+        """
+        start = time.perf_counter()
+
+        candidates = mods_by_module.keys() | self._broken
+        loaded = {m: deps & candidates for m, deps in mod_dependencies.items()}
+        targets = find_dependents(changed, loaded) & candidates
+        order = order_by_dependencies(sorted(targets), loaded)
+
+        # Tear down dependents before the things they depend on
+        was_enabled: dict[str, set[str]] = {}
+        for module in reversed(order):
+            was_enabled[module] = self._unload(module)
+
+        importlib.invalidate_caches()
+
+        reloaded = 0
+        for module in order:
+            if not loaded.get(module, set()).isdisjoint(self._broken):
+                logging.error(f"Not reloading '{module}'; a mod it depends on failed to reload")
+                self._broken.add(module)
+            elif self._load(module, was_enabled[module]):
+                self._broken.discard(module)
+                reloaded += 1
+            else:
+                self._broken.add(module)
+            self._snapshots[module] = _snapshot(mod_sources[module])
+
+        elapsed = (time.perf_counter() - start) * 1000
+        logging.info(
+            f"Hot reloaded {reloaded}/{len(order)} mods in {elapsed:.0f}ms: {', '.join(order)}"
+        )
+
+    @staticmethod
+    def _unload(module: str) -> set[str]:
+        enabled: set[str] = set()
+        mod: Mod
+        for mod in mods_by_module.pop(module, []):
+            if mod.is_enabled:
+                enabled.add(mod.name)
+                # Disabling removes the mod's keybinds and hooks; keep the setting so it comes back
+                mod.disable(dont_update_setting=True)
+            deregister_mod(mod)
+        _remove_registrations(module)
+
+        prefix = f"{module}."
+        for name in [x for x in sys.modules if x == module or x.startswith(prefix)]:
+            del sys.modules[name]
+        return enabled
+
+    @staticmethod
+    def _load(module: str, enabled: set[str]) -> bool:
+        try:
+            new_mods = import_mod(module)
+        except Exception as err:
+            logging.error(f"Failed to hot reload python module: '{module}'")
+            logging.error("".join(traceback.format_exception(err)))
+            return False
+
+        for mod in new_mods:
+            if mod.name in enabled and not mod.is_enabled:
+                mod.enable()
+        return True
@@ -0,0 +1,118 @@
+import tomllib
+
+from dataclasses import dataclass
+from typing import Any
+
+from unrealsdk import logging
+
+from .discovery import ModSource
+
+__all__: tuple[str, ...] = (
+    "ModManifest",
+    "read_manifest",
+)
+
+"""
+Mods may describe themselves statically so the loader can make decisions before importing them.
+The manifest is the `[tool.sdkmod]` table of a `pyproject.toml` in the mod's directory, or the top
+level of a `.sdkmod.toml` file holding the same keys; `.sdkmod.toml` wins if both exist.
+
+```toml
+[tool.sdkmod]
+name = "My Mod"
+author = "Me"
+version = "1.0"
+description = "Does things"
+deferrable = true
+dependencies = ["other_mod"]
+import_thread_safe = true
+```
+"""
+
+
+@dataclass
+class ModManifest:
+    """
+    Static information about a mod, read without importing it.
+
+    Attributes:
+        module: The name of the mod's package.
+        name: The display name of the mod.
+        author: The author of the mod.
+        version: The version string of the mod.
+        description: A short description of the mod.
+        deferrable: If the mod may be imported on first use rather than at startup.
+        dependencies: The packages the mod imports, or None to find them by scanning its imports.
+        import_thread_safe: If the mod's submodules make no unreal calls when imported, so they may
+                            be imported off the game thread.
+    """
+
+    module: str
+    name: str
+    author: str = "Unknown Author"
+    version: str = "Unknown Version"
+    description: str = ""
+    deferrable: bool = False
+    dependencies: list[str] | None = None
+    import_thread_safe: bool = False
+
+    @classmethod
+    def from_table(cls, module: str, table: dict[str, Any]) -> "ModManifest":
+        def get(key: str, default: Any, kind: type) -> Any:
+            if key not in table:
+                return default
+            value = table[key]
+            if not isinstance(value, kind):
+                logging.warning(
+                    f"Ignoring '{key}' in manifest for '{module}'; expected {kind.__name__}"
+                )
+                return default
+            return value
+
+        dependencies = get("dependencies", None, list)
+        if dependencies is not None and not all(isinstance(x, str) for x in dependencies):
+            logging.warning(f"Ignoring 'dependencies' in manifest for '{module}'; expected strings")
+            dependencies = None
+
+        return cls(
+            module=module,
+            name=get("name", module, str),
+            author=get("author", cls.author, str),
+            version=get("version", cls.version, str),
+            description=get("description", cls.description, str),
+            deferrable=get("deferrable", cls.deferrable, bool),
+            dependencies=dependencies,
+            import_thread_safe=get("import_thread_safe", cls.import_thread_safe, bool),
+        )
+
+
+def _read_toml(file: ModSource) -> dict[str, Any] | None:
+    try:
+        with file.open("rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, tomllib.TOMLDecodeError) as ex:
+        logging.warning(f"Failed to read mod manifest '{file}': {ex}")
+        return None
+
+
+def read_manifest(mod_dir: ModSource) -> ModManifest:
+    """
+    Reads the manifest of a mod directory.
+
+    Args:
+        mod_dir: The directory of the mod's package, which may be inside an archive.
+    Returns:
+        The manifest; a default one if the mod does not provide any.
+    """
+    module = mod_dir.name
+
+    table = _read_toml(mod_dir / ".sdkmod.toml")
+    if table is None:
+        pyproject = _read_toml(mod_dir / "pyproject.toml") or {}
+        table = pyproject.get("tool", {}).get("sdkmod", {})
+
+    if not isinstance(table, dict):
+        return ModManifest(module, module)
+    return ModManifest.from_table(module, table)
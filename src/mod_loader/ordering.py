@@ -0,0 +1,174 @@
+import ast
+
+from collections.abc import Collection, Iterator, Mapping
+
+from unrealsdk import logging
+
+from .discovery import ModSource
+
+__all__: tuple[str, ...] = (
+    "order_by_dependencies",
+    "scan_optional_imports",
+    "scan_submodule_imports",
+    "scan_top_level_imports",
+)
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    return (
+        isinstance(test, ast.Attribute)
+        and test.attr == "TYPE_CHECKING"
+        and isinstance(test.value, ast.Name)
+        and test.value.id == "typing"
+    )
+
+
+def _iter_import_nodes(
+    body: list[ast.stmt],
+    optional: bool = False,
+) -> Iterator[tuple[ast.Import | ast.ImportFrom, bool]]:
+    # Yields each import along with if it's allowed to fail
+    for node in body:
+        if isinstance(node, ast.Import | ast.ImportFrom):
+            yield node, optional
+        elif isinstance(node, ast.If):
+            # Type only imports never run, so they aren't dependencies
+            if not _is_type_checking(node.test):
+                yield from _iter_import_nodes(node.body, optional)
+            yield from _iter_import_nodes(node.orelse, optional)
+        elif isinstance(node, ast.Try):
+            # 'try: import x' and its fallbacks only affect load order
+            yield from _iter_import_nodes(node.body, True)
+            for handler in node.handlers:
+                yield from _iter_import_nodes(handler.body, True)
+            yield from _iter_import_nodes(node.orelse, optional)
+            yield from _iter_import_nodes(node.finalbody, optional)
+
+
+def _parse_init(mod_dir: ModSource) -> list[ast.stmt]:
+    try:
+        source = (mod_dir / "__init__.py").read_bytes()
+        return ast.parse(source, filename=str(mod_dir / "__init__.py")).body
+    except (OSError, SyntaxError, ValueError):
+        # The import will fail loudly later on, no need to do it twice
+        return []
+
+
+def _scan_top_level(mod_dir: ModSource, optional: bool) -> set[str]:
+    names: set[str] = set()
+    for node, is_optional in _iter_import_nodes(_parse_init(mod_dir)):
+        if is_optional != optional:
+            continue
+        if isinstance(node, ast.Import):
+            names.update(alias.name.partition(".")[0] for alias in node.names)
+        # Relative imports stay within the mod
+        elif node.level == 0 and node.module is not None:
+            names.add(node.module.partition(".")[0])
+    return names
+
+
+def scan_top_level_imports(mod_dir: ModSource) -> set[str]:
+    """
+    Statically finds the top level packages a mod's `__init__.py` requires.
+
+    Imports under 'if TYPE_CHECKING' are ignored, and those inside a 'try' are left to
+    `scan_optional_imports`.
+
+    Args:
+        mod_dir: The directory of the mod's package, which may be inside an archive.
+    Returns:
+        The first component of every absolute import at module level.
+    """
+    return _scan_top_level(mod_dir, False)
+
+
+def scan_optional_imports(mod_dir: ModSource) -> set[str]:
+    """
+    Statically finds the top level packages a mod's `__init__.py` imports inside a 'try'.
+
+    These should be loaded first if present, but a mod isn't skipped when one of them fails.
+
+    Args:
+        mod_dir: The directory of the mod's package, which may be inside an archive.
+    Returns:
+        The first component of every absolute import inside a 'try' at module level.
+    """
+    return _scan_top_level(mod_dir, True)
+
+
+def scan_submodule_imports(mod_dir: ModSource) -> list[str]:
+    """
+    Statically finds the submodules of a mod which its `__init__.py` imports.
+
+    Names imported via `from . import x` are included even though they may turn out to be
+    attributes rather than modules.
+
+    Args:
+        mod_dir: The directory of the mod's package, which may be inside an archive.
+    Returns:
+        The fully qualified names of the submodules, in the order they are first imported.
+    """
+    package = mod_dir.name
+    names: dict[str, None] = {}
+    for node, _ in _iter_import_nodes(_parse_init(mod_dir)):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith(f"{package}."):
+                    names[alias.name] = None
+        elif node.level == 1:
+            if node.module is not None:
+                names[f"{package}.{node.module}"] = None
+            else:
+                names.update((f"{package}.{alias.name}", None) for alias in node.names)
+        elif node.level == 0 and node.module is not None and node.module.startswith(f"{package}."):
+            names[node.module] = None
+    return list(names)
+
+
+def order_by_dependencies(
+    mods: Collection[str],
+    dependencies: Mapping[str, Collection[str]],
+) -> list[str]:
+    """
+    Sorts mods so that every mod comes after the mods it depends on.
+
+    Ties keep their original order. Mods caught in a cycle are logged and then loaded in their
+    original order once everything they depend on outside the cycle has been placed.
+
+    Args:
+        mods: The mods to sort, in their default load order.
+        dependencies: The mods each mod depends on; names not in `mods` are ignored.
+    Returns:
+        The mods in load order.
+    """
+    known = set(mods)
+    order: list[str] = []
+    done: set[str] = set()
+    visiting: list[str] = []
+    cycles: list[list[str]] = []
+
+    def visit(mod: str) -> None:
+        if mod in done:
+            return
+        if mod in visiting:
+            cycles.append(visiting[visiting.index(mod):] + [mod])
+            return
+
+        visiting.append(mod)
+        for dep in dependencies.get(mod, ()):
+            if dep in known and dep != mod:
+                visit(dep)
+        visiting.pop()
+
+        done.add(mod)
+        order.append(mod)
+
+    for mod in mods:
+        visit(mod)
+
+    for cycle in cycles:
+        logging.warning(f"Mods have a circular dependency: {' -> '.join(cycle)}")
+
+    return order
@@ -0,0 +1,278 @@
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import sys
+import threading
+import time
+
+from collections.abc import Collection, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import ModuleType
+from typing import Any
+
+from unrealsdk import logging
+
+from .discovery import ModSource
+from .ordering import scan_submodule_imports
+
+__all__: tuple[str, ...] = ("ParallelImporter",)
+
+"""
+Opt-in concurrent import of mods which declare `import_thread_safe = true` in their manifest.
+
+A worker thread creates the mod's package without running its `__init__.py`, then imports the
+submodules that `__init__.py` pulls in. That is where nearly all of the import time is spent. The
+package body, which usually calls `build_mod` and so may touch unreal, is run later by the regular
+load loop on the game thread. A mod is only handed to a worker once every mod it depends on has
+been fully loaded.
+
+The submodules can only be imported with their package in `sys.modules`, so it's there while the
+worker imports them, marked as initializing and with its module lock held like any other import in
+progress. Once prepared it's taken back out. It only goes back in on the game thread, right before
+its body is run, either by the load loop or by the first import of it from the game thread.
+
+The first error on a worker switches everything still pending back to serial import.
+
+Making other threads wait on the package rather than see it half built relies on the import system's
+module locks and `spec._initializing`. Neither is public, so if the lock manager is missing
+everything is imported serially instead.
+"""
+
+# Private, so looked up defensively; None switches every mod to serial import
+_ModuleLockManager: Any = getattr(
+    getattr(importlib, "_bootstrap", None), "_ModuleLockManager", None
+)
+
+
+class _PreparedLoader(importlib.abc.Loader):
+    # Hands out an already prepared package, then runs its body
+    def __init__(self, package: ModuleType) -> None:
+        self.package = package
+        self.spec = package.__spec__
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType:
+        return self.package
+
+    def exec_module(self, module: ModuleType) -> None:
+        # The import system replaced these with our spec, put the real ones back
+        module.__spec__ = self.spec
+        module.__loader__ = self.spec.loader  # type: ignore[union-attr]
+        self.spec.loader.exec_module(module)  # type: ignore[union-attr]
+
+
+class _OffThreadGuard(importlib.abc.MetaPathFinder):
+    # Stops a worker from importing another mod, since that would run its body off the game thread.
+    #  Also finishes off prepared mods which the game thread imports before the load loop does.
+    def __init__(self, importer: "ParallelImporter") -> None:
+        self.importer = importer
+        self.local = threading.local()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Any = None,
+        target: Any = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        if path is not None or fullname not in self.importer.discovered:
+            return None
+
+        if threading.current_thread() is threading.main_thread():
+            package = self.importer._take_prepared(fullname)
+            if package is None:
+                return None
+            return importlib.machinery.ModuleSpec(
+                fullname,
+                _PreparedLoader(package),
+                origin=package.__spec__.origin,  # type: ignore[union-attr]
+                is_package=True,
+            )
+
+        if fullname != getattr(self.local, "preparing", None):
+            raise ImportError(f"'{fullname}' must be imported on the game thread", name=fullname)
+        return None
+
+
+class ParallelImporter:
+    """
+    Prepares thread safe mods on a thread pool while the game thread loads everything else.
+
+    Attributes:
+        sources: Where each eligible mod lives.
+        dependencies: The top level modules each mod depends on.
+        discovered: Every discovered mod, whether eligible or not.
+        fell_back: Set once an error has switched the remaining mods back to serial import.
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, ModSource],
+        dependencies: Mapping[str, Collection[str]],
+        discovered: Collection[str],
+        workers: int | None = None,
+    ) -> None:
+        self.sources = sources
+        self.dependencies = dependencies
+        self.discovered = set(discovered)
+        self.fell_back = False
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mod_import")
+        self._guard = _OffThreadGuard(self)
+        self._futures: dict[str, Future[tuple[ModuleType | None, float]]] = {}
+        self._finished: set[str] = set()
+        self._taken: set[str] = set()
+
+        self._start = time.perf_counter()
+        self._worker_time = 0.0
+        self._wait_time = 0.0
+        self._prepared = 0
+
+    def start(self) -> None:
+        sys.meta_path.insert(0, self._guard)
+        if _ModuleLockManager is None:
+            logging.warning("Parallel imports aren't supported by this python; importing serially")
+            self.fell_back = True
+            return
+        self._submit_ready()
+
+    def _is_ready(self, module: str) -> bool:
+        return all(
+            dep == module or dep not in self.discovered or dep in self._finished
+            for dep in self.dependencies.get(module, ())
+        )
+
+    def _submit_ready(self) -> None:
+        if self.fell_back:
+            return
+        for module in self.sources:
+            if module not in self._futures and self._is_ready(module):
+                self._futures[module] = self._pool.submit(self._prepare, module)
+
+    def _prepare(self, module: str) -> tuple[ModuleType | None, float]:
+        start = time.perf_counter()
+        self._guard.local.preparing = module
+
+        spec = importlib.util.find_spec(module)
+        if spec is None or spec.submodule_search_locations is None:
+            raise ImportError(f"'{module}' is not a package", name=module)
+
+        package = importlib.util.module_from_spec(spec)
+        with _ModuleLockManager(module):
+            # Already imported regularly by the game thread
+            if module in sys.modules:
+                return None, time.perf_counter() - start
+
+            # Read by the fast path of 'import', which then waits on the module lock we hold
+            spec._initializing = True  # type: ignore[attr-defined]
+            sys.modules[module] = package
+            try:
+                for submodule in scan_submodule_imports(self.sources[module]):
+                    # 'from . import x' may name an attribute defined in '__init__.py'
+                    if importlib.util.find_spec(submodule) is not None:
+                        importlib.import_module(submodule)
+            except BaseException:
+                _discard(module)
+                raise
+            finally:
+                spec._initializing = False  # type: ignore[attr-defined]
+                sys.modules.pop(module, None)
+
+        return package, time.perf_counter() - start
+
+    def _take_prepared(self, module: str) -> ModuleType | None:
+        # Only called on the game thread; never waits, since the worker may be stuck on an import
+        #  lock the game thread holds
+        future = self._futures.get(module)
+        if (
+            future is None
+            or self.fell_back
+            or module in self._taken
+            or not future.done()
+            or future.cancelled()
+            or future.exception() is not None
+        ):
+            return None
+
+        package, elapsed = future.result()
+        self._taken.add(module)
+        if package is not None:
+            self._worker_time += elapsed
+            self._prepared += 1
+        return package
+
+    def take(self, module: str) -> ModuleType | None:
+        """
+        Waits for a mod to be prepared, then puts its package back into `sys.modules`.
+
+        Must be called from the game thread.
+
+        Args:
+            module: The name of the mod about to be loaded.
+        Returns:
+            The prepared package to pass to `import_mod`, or None to import it normally.
+        """
+        future = self._futures.get(module)
+        if future is None or self.fell_back or module in self._taken:
+            return None
+
+        start = time.perf_counter()
+        try:
+            future.result()
+        except Exception as err:
+            self._wait_time += time.perf_counter() - start
+            logging.warning(f"Parallel import of '{module}' failed; importing serially from now on")
+            logging.dev_warning(f"{type(err).__name__}: {err}")
+            self._fall_back()
+            return None
+        self._wait_time += time.perf_counter() - start
+
+        package = self._take_prepared(module)
+        if package is not None:
+            sys.modules[module] = package
+        return package
+
+    def finished(self, module: str) -> None:
+        """Marks a mod as fully loaded, allowing mods which depend on it to start."""
+        self._finished.add(module)
+        self._submit_ready()
+
+    def _fall_back(self) -> None:
+        self.fell_back = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+        # Anything prepared but not yet taken has to be imported again from scratch
+        for module, future in self._futures.items():
+            if module in self._finished or future.cancelled():
+                continue
+            if future.exception() is None:
+                _discard_prepared(module)
+
+    def close(self) -> None:
+        """Shuts down the pool and logs the time saved over a serial import."""
+        if not self.fell_back:
+            self._pool.shutdown(wait=True)
+            for module, future in self._futures.items():
+                if module not in self._finished and future.exception() is None:
+                    _discard_prepared(module)
+        sys.meta_path.remove(self._guard)
+
+        if self._prepared == 0:
+            return
+
+        wall = time.perf_counter() - self._start
+        serial = wall - self._wait_time + self._worker_time
+        logging.info(
+            f"Prepared {self._prepared} mods in parallel; {wall * 1000:.0f}ms against an estimated"
+            f" {serial * 1000:.0f}ms serial ({serial / wall:.2f}x)"
+        )
+
+
+def _discard(module: str) -> None:
+    prefix = f"{module}."
+    for name in [x for x in sys.modules if x == module or x.startswith(prefix)]:
+        del sys.modules[name]
+
+
+def _discard_prepared(module: str) -> None:
+    # The package itself is never left in sys.modules, so if it's there it was imported regularly
+    if module not in sys.modules:
+        _discard(module)
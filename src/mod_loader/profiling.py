@@ -0,0 +1,132 @@
+import json
+import sys
+import time
+import tracemalloc
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from unrealsdk import logging
+
+__all__: tuple[str, ...] = (
+    "ImportProfile",
+    "ImportProfiler",
+)
+
+
+@dataclass
+class ImportProfile:
+    """
+    Measurements for a single top level mod import.
+
+    Attributes:
+        name: The name of the imported module.
+        succeeded: If the import completed without raising.
+        wall_time: Wall clock seconds spent importing.
+        cpu_time: Process CPU seconds spent importing.
+        modules_imported: Number of entries added to `sys.modules`, including the mod itself.
+        peak_alloc: Peak bytes traced above the starting point during the import.
+        net_alloc: Bytes still allocated once the import finished.
+    """
+
+    name: str
+    succeeded: bool = False
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    modules_imported: int = 0
+    peak_alloc: int = 0
+    net_alloc: int = 0
+
+
+@dataclass
+class ImportProfiler:
+    """
+    Collects an ImportProfile for every mod imported between `start()` and `stop()`.
+
+    Note that tracemalloc adds a noticeable overhead to every allocation, so the absolute times are
+    inflated; they are still useful for comparing mods against each other.
+    """
+
+    profiles: list[ImportProfile] = field(default_factory=list)
+
+    # Only stop tracing if we were the ones to start it, so a user's own session survives
+    _started_tracing: bool = field(default=False, init=False, repr=False)
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[ImportProfile]:
+        """
+        Context manager which profiles the body as the import of the given mod.
+
+        Args:
+            name: The name of the mod being imported.
+        Returns:
+            The profile; it is filled in once the body exits, even if it raised.
+        """
+        profile = ImportProfile(name)
+        modules_before = len(sys.modules)
+        tracemalloc.reset_peak()
+        mem_before, _ = tracemalloc.get_traced_memory()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+
+        try:
+            yield profile
+            profile.succeeded = True
+        finally:
+            profile.wall_time = time.perf_counter() - wall_before
+            profile.cpu_time = time.process_time() - cpu_before
+            mem_after, mem_peak = tracemalloc.get_traced_memory()
+            profile.peak_alloc = max(mem_peak - mem_before, 0)
+            profile.net_alloc = mem_after - mem_before
+            profile.modules_imported = len(sys.modules) - modules_before
+            self.profiles.append(profile)
+
+    def sorted_profiles(self) -> list[ImportProfile]:
+        return sorted(self.profiles, key=lambda x: x.wall_time, reverse=True)
+
+    def log_report(self) -> None:
+        """Logs every profile as a table, slowest import first."""
+        header = (
+            f"{'Mod':<32} {'Wall ms':>10} {'CPU ms':>10} {'Modules':>8}"
+            f" {'Peak KiB':>10} {'Net KiB':>10}"
+        )
+        logging.info("Mod import profile:")
+        logging.info(header)
+        logging.info("-" * len(header))
+
+        for p in self.sorted_profiles():
+            name = p.name if p.succeeded else f"{p.name} (failed)"
+            logging.info(
+                f"{name:<32} {p.wall_time * 1000:>10.2f} {p.cpu_time * 1000:>10.2f}"
+                f" {p.modules_imported:>8} {p.peak_alloc / 1024:>10.1f} {p.net_alloc / 1024:>10.1f}"
+            )
+
+        total_wall = sum(p.wall_time for p in self.profiles)
+        total_cpu = sum(p.cpu_time for p in self.profiles)
+        logging.info("-" * len(header))
+        logging.info(
+            f"{'Total':<32} {total_wall * 1000:>10.2f} {total_cpu * 1000:>10.2f}"
+            f" {sum(p.modules_imported for p in self.profiles):>8}"
+        )
+
+    def write_json(self, file: Path) -> None:
+        """Writes every profile to a json file, slowest import first."""
+        try:
+            with file.open("w", encoding="utf-8") as out:
+                json.dump([asdict(p) for p in self.sorted_profiles()], out, indent=2)
+        except OSError as ex:
+            logging.warning(f"Failed to write mod import profile '{file}': {ex}")
+            return
+        logging.info(f"Wrote mod import profile to '{file}'")
@@ -0,0 +1,57 @@
+import importlib
+import sys
+
+from types import ModuleType
+
+from unrealsdk import logging
+
+from mods_base import Mod
+from mods_base.mod_list import mod_list
+
+from .discovery import ModSource
+
+__all__: tuple[str, ...] = (
+    "import_mod",
+    "mod_dependencies",
+    "mod_sources",
+    "mods_by_module",
+)
+
+# Where each discovered mod's package lives
+mod_sources: dict[str, ModSource] = {}
+
+# The top level modules each discovered mod depends on
+mod_dependencies: dict[str, set[str]] = {}
+
+# The mods registered while importing each top level module
+mods_by_module: dict[str, list[Mod]] = {}
+
+
+def import_mod(module: str, prepared: ModuleType | None = None) -> list[Mod]:
+    """
+    Imports a mod's package, recording which mods it registered.
+
+    Args:
+        module: The name of the package to import.
+        prepared: A package which is already in `sys.modules` but whose body has not been run yet,
+                  as returned by `ParallelImporter.take`. If given, only its body is run.
+    Returns:
+        The mods added to the mod list by the import.
+    """
+    known_mods = set(map(id, mod_list))
+    if prepared is None:
+        importlib.import_module(module)
+    else:
+        try:
+            prepared.__spec__.loader.exec_module(prepared)  # type: ignore[union-attr]
+        except BaseException:
+            # Same as a regular import, a failed module doesn't stay in sys.modules
+            sys.modules.pop(module, None)
+            raise
+
+    new_mods = [mod for mod in mod_list if id(mod) not in known_mods]
+    if not new_mods:
+        logging.dev_warning(f"Module '{module}' did not register a mod")
+
+    mods_by_module[module] = new_mods
+    return new_mods
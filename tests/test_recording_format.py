@@ -0,0 +1,111 @@
+import importlib.util
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+# The keybinds package needs the native module, so load the reader on its own, like it's used
+#  outside the game
+_spec = importlib.util.spec_from_file_location(
+    "recording_format",
+    Path(__file__).parent.parent / "src" / "keybinds" / "recording_format.py",
+)
+assert _spec is not None and _spec.loader is not None
+recording_format = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = recording_format
+_spec.loader.exec_module(recording_format)
+
+RecordedEvent = recording_format.RecordedEvent
+
+TICK = 0xFF
+IE_PRESSED = 0
+IE_RELEASED = 1
+IE_AXIS = 4
+
+
+def write_recording(
+    path: Path,
+    keys: list[str],
+    events: list[tuple[int, float, int, int, int]],
+    version: int = 2,
+) -> None:
+    # Same layout as the native write_recording
+    length = struct.Struct("<H" if version == 2 else "<B")
+    data = bytearray(struct.pack("<4sHH", b"KBRC", version, len(keys)))
+    for key in keys:
+        name = key.encode("utf-8")
+        data += length.pack(len(name)) + name
+    data += struct.pack("<Q", len(events))
+    for event in events:
+        data += struct.pack("<QfHBB", *event)
+    path.write_bytes(data)
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    long_key = "K" * 300
+    path = tmp_path / "input.kbrc"
+    write_recording(
+        path,
+        ["F1", long_key],
+        [
+            (1_000_000, 1.0, 0, IE_PRESSED, 0b10),
+            (2_000_000, 0.5, 1, IE_AXIS, 0b01),
+            (3_000_000, 0.0, 0, TICK, 0),
+            (4_000_000, 0.0, 0, IE_RELEASED, 0b10),
+        ],
+    )
+
+    assert list(recording_format.read_recording(path)) == [
+        RecordedEvent(0.001, "F1", IE_PRESSED, 1.0, False, True),
+        RecordedEvent(0.002, long_key, IE_AXIS, 0.5, True, False),
+        RecordedEvent(0.003, None, None, 0.0, False, False),
+        RecordedEvent(0.004, "F1", IE_RELEASED, 0.0, False, True),
+    ]
+
+
+def test_reads_short_key_names(tmp_path: Path) -> None:
+    path = tmp_path / "input.kbrc"
+    write_recording(path, ["Escape"], [(0, 1.0, 0, IE_PRESSED, 0)], version=1)
+
+    assert [e.key for e in recording_format.read_recording(path)] == ["Escape"]
+
+
+def test_rejects_bad_recordings(tmp_path: Path) -> None:
+    path = tmp_path / "input.kbrc"
+
+    path.write_bytes(b"NOPE" + bytes(12))
+    with pytest.raises(ValueError, match="not a supported"):
+        list(recording_format.read_recording(path))
+
+    write_recording(path, ["F1"], [(0, 1.0, 0, IE_PRESSED, 0)] * 2)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        list(recording_format.read_recording(path))
+
+
+def test_replay(tmp_path: Path) -> None:
+    path = tmp_path / "input.kbrc"
+    write_recording(
+        path,
+        ["F1"],
+        [
+            (0, 1.0, 0, IE_PRESSED, 0b10),
+            (0, 0.0, 0, TICK, 0),
+            (0, 0.0, 0, IE_RELEASED, 0b10),
+            (0, 0.0, 0, TICK, 0),
+        ],
+    )
+
+    dispatched: list[tuple[str, int, float, bool]] = []
+    ticks: list[None] = []
+    count, elapsed = recording_format.replay_recording(
+        path,
+        lambda *args: dispatched.append(args),
+        lambda: ticks.append(None),
+    )
+
+    assert count == 2
+    assert elapsed >= 0
+    assert dispatched == [("F1", IE_PRESSED, 1.0, True), ("F1", IE_RELEASED, 0.0, True)]
+    assert len(ticks) == 2